@@ -1,10 +1,17 @@
+import functools
+import json
+from contextvars import ContextVar
+from pathlib import Path
+
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
 import pandas as pd
 from datetime import datetime, date, time
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import db
 import excel_utils
+import jobs
 
 MARKETPLACES = ["EU5", "EU", "3PX", "MENA", "AU", "SG", "NA", "JP", "ZA"]
 CASE_SOURCES = ["ASTRO", "WINSTON"]
@@ -61,9 +68,137 @@ SUB_STATUSES = [
     "SUPPORT",
     "HANDOVER",
 ]
+VIEWS = ["Cases", "Updates"]
+PAGE_SIZES = [25, 50, 100, 250]
+CASE_SORT_LABELS = {
+    "case_id": "Case ID",
+    "seller_name": "Seller",
+    "specialist_name": "Specialist",
+    "marketplace": "Marketplace",
+    "case_status": "Status",
+    "workstream": "Workstream",
+    "priority": "Priority",
+}
+UPDATE_SORT_LABELS = {"timestamp": "Timestamp", "id": "ID"}
+IMPORT_MODE_LABELS = {
+    "skip": "Add new rows only",
+    "merge": "Merge: add new rows and update changed ones",
+}
+# Import column -> values the import accepts ("" allows a blank cell).
+# Last Sub-Status is left out: it is free text on the case form and is
+# normally derived from the case's latest update.
+IMPORT_ALLOWED_VALUES = {
+    "Marketplace": MARKETPLACES,
+    "Case Source": CASE_SOURCES,
+    "Case Status": CASE_STATUSES,
+    "Workstream": WORKSTREAMS,
+    "Complexity": COMPLEXITIES,
+    "Priority": PRIORITIES,
+    "Seller Type": SELLER_TYPES,
+    "Sub Status": SUB_STATUSES,
+}
+# Export format -> (label, file name, mime type).
+EXPORT_FORMATS = {
+    "xlsx": (
+        "Excel",
+        "CaseManagement_Export.xlsx",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ),
+    "csv": ("CSV", "CaseManagement_Export_csv.zip", "application/zip"),
+    "parquet": ("Parquet", "CaseManagement_Export_parquet.zip", "application/zip"),
+}
+
+
+class RunData:
+    """db results shared by the sections of one script run.
+
+    Each value is loaded at most once per run, and again only if the data
+    changed mid-run, so e.g. the Updates filter and the update form share
+    one case ID list. Get the current run's instance with ``run_data()``.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[int, Any]] = {}
+
+    def get(self, name: str, load: Callable[[], Any]) -> Any:
+        token = db.data_token()
+        cached = self._values.get(name)
+        if cached is None or cached[0] != token:
+            cached = self._values[name] = (token, load())
+        return cached[1]
+
+    def case_ids(self) -> List[str]:
+        return self.get("case_ids", db.list_case_ids)
+
+    def api_options(self) -> List[str]:
+        return self.get("api_options", db.list_api_options)
+
+    def issue_options(self) -> List[str]:
+        return self.get("issue_options", db.list_issue_options)
+
+
+_run_data: ContextVar[RunData] = ContextVar("run_data")
+
+
+def run_data() -> RunData:
+    return _run_data.get()
+
+
+def fragment(func: Callable) -> Callable:
+    """``st.fragment`` that also gives the fragment's own reruns a
+    ``RunData``; during a full run it shares the run's instance.
+
+    Interacting with a fragment's widgets reruns only that fragment, and a
+    fragment refreshes itself after a write with ``rerun_fragment()``, so
+    e.g. saving a case does not re-render the filters or the option manager.
+    """
+
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        if _run_data.get(None) is not None:
+            return func(*args, **kwargs)
+        token = _run_data.set(RunData())
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _run_data.reset(token)
+
+    return st.fragment(run)
+
+
+def rerun_fragment():
+    """Rerun just the running fragment, or the whole app if the fragment is
+    being drawn as part of a full run (where Streamlit refuses a
+    fragment-scoped rerun)."""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+
+def kept(key: str, default: Any = None) -> Dict[str, Any]:
+    """Widget keyword arguments that keep its value across view switches.
+
+    Streamlit drops the state of widgets a run does not render, so with only
+    the active view rendered e.g. the sort order would reset on every switch.
+    The value is also stored under a plain ``saved_<key>`` session key and
+    put back before the widget is drawn again.
+    """
+    if key not in st.session_state:
+        value = st.session_state.get(f"saved_{key}", default)
+        if value is not None:
+            st.session_state[key] = value
+    return {"key": key, "on_change": _save_kept, "args": (key,)}
+
+
+def _save_kept(key: str):
+    st.session_state[f"saved_{key}"] = st.session_state[key]
 
 
 def init_state():
+    if "active_view" not in st.session_state:
+        requested = st.query_params.get("tab")
+        st.session_state.active_view = requested if requested in VIEWS else VIEWS[0]
     st.session_state.setdefault("case_filters", {})
     st.session_state.setdefault("selected_case_id", None)
     st.session_state.setdefault("edit_case_id", None)
@@ -72,6 +207,8 @@ def init_state():
     st.session_state.setdefault("show_case_form", False)
     st.session_state.setdefault("show_update_form", False)
     st.session_state.setdefault("selected_update_case", None)
+    st.session_state.setdefault("export_jobs", {})
+    st.session_state.setdefault("import_job_id", None)
 
 
 def main():
@@ -86,27 +223,34 @@ def main():
 
     st.title("Case Management System (Streamlit)")
 
-    tab_cases, tab_updates = st.tabs(["Cases", "Updates"])
-
-    with tab_cases:
-        render_cases_tab()
+    token = _run_data.set(RunData())
+    try:
+        # Unlike st.tabs, which runs every tab's body, only the active view
+        # is rendered, so a rerun only loads what is on screen.
+        view = st.radio(
+            "View",
+            options=VIEWS,
+            horizontal=True,
+            key="active_view",
+            label_visibility="collapsed",
+        )
+        st.query_params["tab"] = view
+        if view == "Updates":
+            render_updates_tab()
+        else:
+            render_cases_tab()
 
-    with tab_updates:
-        render_updates_tab()
+        if db.query_log_enabled():
+            render_query_profile()
+    finally:
+        _run_data.reset(token)
 
 
 def render_cases_tab():
     st.subheader("Case Management")
 
-    metrics = db.fetch_summary_counts()
-    cols = st.columns(5)
-    cols[0].metric("Total Cases", metrics["total"])
-    cols[1].metric("Submitted", metrics["SUBMITTED"])
-    cols[2].metric("WIP", metrics["WIP"])
-    cols[3].metric("Completed", metrics["COMPLETED"])
-    cols[4].metric("Cancelled", metrics["CANCELLED"])
-
     render_option_manager()
+    render_archive_manager()
 
     st.markdown("#### Filters")
     with st.form(key="case_filters_form"):
@@ -146,27 +290,97 @@ def render_cases_tab():
             value=st.session_state.case_filters.get("issue_type", ""),
         )
 
+        filter_cols3 = st.columns(4)
+        issue_filter, issue_mode = _list_filter_inputs(
+            filter_cols3[0:2], "issue_type", "Issue Type", run_data().issue_options()
+        )
+        api_filter, api_mode = _list_filter_inputs(
+            filter_cols3[2:4], "api_supported", "API", run_data().api_options()
+        )
+
         submitted = st.form_submit_button("Apply filters")
         if submitted:
             st.success("Filters applied. Scroll down to view results.")
 
-    cases = db.list_cases(st.session_state.case_filters)
+    for field, selected, mode in (
+        ("issue_type", issue_filter, issue_mode),
+        ("api_supported", api_filter, api_mode),
+    ):
+        st.session_state.case_filters.pop(f"{field}_any", None)
+        st.session_state.case_filters.pop(f"{field}_all", None)
+        if selected:
+            st.session_state.case_filters[f"{field}_{mode}"] = selected
+
+    render_case_workspace()
+
+
+@fragment
+def render_case_workspace():
+    # Everything a case write changes — the metrics, the table and the
+    # selected case — so saving or deleting a case reruns only this part.
+    metrics = db.fetch_summary_counts()
+    cols = st.columns(5)
+    cols[0].metric("Total Cases", metrics["total"])
+    cols[1].metric("Submitted", metrics["SUBMITTED"])
+    cols[2].metric("WIP", metrics["WIP"])
+    cols[3].metric("Completed", metrics["COMPLETED"])
+    cols[4].metric("Cancelled", metrics["CANCELLED"])
 
     buttons_col, _, download_col = st.columns([2, 4, 3])
     if buttons_col.button("➕ Add new case", use_container_width=True):
         st.session_state.edit_case_id = None
         st.session_state.show_case_form = True
 
-    export_bytes = excel_utils.build_export_workbook(
-        cases, db.list_updates()
+    include_archived = download_col.checkbox(
+        "Include archived cases", **kept("include_archived")
     )
-    download_col.download_button(
-        "⬇️ Export to Excel",
-        data=export_bytes,
-        file_name="CaseManagement_Export.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        use_container_width=True,
+    export_format = download_col.selectbox(
+        "Export format",
+        options=list(EXPORT_FORMATS),
+        format_func=lambda option: EXPORT_FORMATS[option][0],
+        **kept("export_format"),
+    )
+    label, file_name, mime = EXPORT_FORMATS[export_format]
+    # The export is only built when asked for, and kept until the data (or
+    # the filters / format) change, so reruns do not re-read every row.
+    export_key = (
+        json.dumps(st.session_state.case_filters, sort_keys=True, default=str),
+        include_archived,
+        export_format,
+        db.current_version(),
     )
+    export_bytes = export_cache().get(export_key)
+    if export_bytes is None:
+        # Exports are built by a background job; its finished file is read
+        # back once and then served from the cache.
+        job_id = st.session_state.export_jobs.get(export_key)
+        job = db.get_job(job_id) if job_id else None
+        if job and job["status"] == "succeeded":
+            export_bytes = Path(job["artifact_path"]).read_bytes()
+            export_cache().put(export_key, export_bytes)
+        elif job and job["status"] in ("queued", "running"):
+            render_job_status(download_col, job, "Export")
+        else:
+            if job:
+                download_col.error(f"Export failed: {job['error']}")
+            if download_col.button(
+                f"📦 Prepare {label} export", use_container_width=True
+            ):
+                st.session_state.export_jobs[export_key] = jobs.submit_export(
+                    export_format,
+                    file_name,
+                    st.session_state.case_filters,
+                    include_archived,
+                )
+                rerun_fragment()
+    if export_bytes is not None:
+        download_col.download_button(
+            f"⬇️ Export to {label}",
+            data=export_bytes,
+            file_name=file_name,
+            mime=mime,
+            use_container_width=True,
+        )
 
     template_bytes = excel_utils.build_empty_template()
     download_col.download_button(
@@ -178,27 +392,94 @@ def render_cases_tab():
         key="download_template",
     )
 
-    st.markdown("#### Import from Excel")
+    st.markdown("#### Import from Excel, CSV or Parquet")
     importer_cols = st.columns([2, 1])
     uploaded_file = importer_cols[0].file_uploader(
-        "Upload Excel file", type=["xlsx", "xls"], key="cases_import"
+        "Upload an Excel workbook, a CSV/Parquet file, or a zip of Cases and "
+        "Updates files",
+        type=["xlsx", "xls", "csv", "parquet", "zip"],
+        key="cases_import",
+    )
+    import_mode = importer_cols[1].radio(
+        "Existing cases",
+        options=list(IMPORT_MODE_LABELS),
+        format_func=IMPORT_MODE_LABELS.get,
+        **kept("import_mode"),
+    )
+    strict_import = importer_cols[1].checkbox(
+        "Import only if the check finds no errors",
+        help="Check the whole file first and import nothing if it has errors.",
+        **kept("import_strict", False),
     )
+    if uploaded_file and importer_cols[1].button(
+        "Check file", use_container_width=True
+    ):
+        try:
+            st.session_state.import_job_id = jobs.submit_validation(
+                uploaded_file, uploaded_file.name, IMPORT_ALLOWED_VALUES
+            )
+        except Exception as exc:
+            st.error(f"Check failed: {exc}")
+        else:
+            rerun_fragment()
     if uploaded_file and importer_cols[1].button("Import", use_container_width=True):
-        import_cases_from_excel(uploaded_file)
-        st.rerun()
+        try:
+            st.session_state.import_job_id = jobs.submit_import(
+                uploaded_file,
+                uploaded_file.name,
+                import_mode,
+                IMPORT_ALLOWED_VALUES,
+                strict=strict_import,
+            )
+        except Exception as exc:
+            st.error(f"Import failed: {exc}")
+        else:
+            rerun_fragment()
+    render_import_job()
 
     st.markdown("#### Cases Table")
-    if cases:
-        cases_df = pd.DataFrame(cases)
-        display_df = cases_df.copy()
-        display_df["issue_type"] = display_df["issue_type"].apply(
-            lambda x: ", ".join(x) if isinstance(x, list) else x
-        )
-        display_df["api_supported"] = display_df["api_supported"].apply(
-            lambda x: ", ".join(x) if isinstance(x, list) else x
-        )
-        st.dataframe(display_df, use_container_width=True, hide_index=True)
-        case_ids = [case["case_id"] for case in cases]
+    sort_cols = st.columns([2, 1, 1])
+    sort_by = sort_cols[0].selectbox(
+        "Sort by",
+        options=list(CASE_SORT_LABELS),
+        format_func=CASE_SORT_LABELS.get,
+        **kept("cases_sort_by"),
+    )
+    descending = sort_cols[1].selectbox(
+        "Order", options=["Ascending", "Descending"], **kept("cases_sort_order")
+    ) == "Descending"
+    page_size = sort_cols[2].selectbox(
+        "Rows per page",
+        options=PAGE_SIZES,
+        **kept("cases_page_size", PAGE_SIZES[1]),
+    )
+
+    cursor = _page_cursor(
+        "cases_pager",
+        [
+            st.session_state.case_filters,
+            sort_by,
+            descending,
+            page_size,
+            include_archived,
+        ],
+    )
+    page = db.list_cases_page(
+        st.session_state.case_filters,
+        page_size=page_size,
+        sort_by=sort_by,
+        descending=descending,
+        cursor=cursor,
+        with_total=True,
+        as_frame=True,
+        include_archived=include_archived,
+    )
+    cases_df = page.rows
+
+    if not cases_df.empty:
+        st.dataframe(cases_df, use_container_width=True, hide_index=True)
+        render_pager("cases_pager", page, page_size, "cases")
+        case_ids = cases_df["case_id"].tolist()
 
         st.markdown("#### Case Actions")
         st.session_state.selected_case_id = st.selectbox(
@@ -213,8 +494,14 @@ def render_cases_tab():
 
         if st.session_state.selected_case_id:
             selected_case = db.get_case(st.session_state.selected_case_id)
+            archived = False
+            if not selected_case and include_archived:
+                selected_case = db.get_case(
+                    st.session_state.selected_case_id, include_archived=True
+                )
+                archived = selected_case is not None
             if selected_case:
-                render_case_details(selected_case)
+                render_case_details(selected_case, archived)
     else:
         st.info("No cases found. Use 'Add new case' to create one.")
 
@@ -227,35 +514,93 @@ def render_cases_tab():
         render_case_form(case_to_edit)
 
 
+def _list_filter_inputs(columns, field: str, label: str, options: List[str]):
+    filters = st.session_state.case_filters
+    mode = "all" if filters.get(f"{field}_all") else "any"
+    current = filters.get(f"{field}_{mode}", [])
+    selected = columns[0].multiselect(
+        f"{label} has",
+        options=options,
+        default=[name for name in current if name in options],
+    )
+    mode = columns[1].radio(
+        "Match",
+        options=["any", "all"],
+        index=1 if mode == "all" else 0,
+        format_func=lambda value: f"{value} of",
+        horizontal=True,
+        key=f"{field}_match_mode",
+    )
+    return selected, mode
+
+
+def render_query_profile():
+    with st.sidebar.expander("SQL profile", expanded=False):
+        summary = db.query_log_summary()
+        if summary:
+            st.dataframe(pd.DataFrame(summary), hide_index=True)
+        else:
+            st.caption("No statements recorded yet.")
+        slow = db.query_log_records(slow_only=True)
+        st.caption(f"{len(slow)} slow statements captured with their query plans.")
+        st.download_button(
+            "Download query log (JSON lines)",
+            data=db.export_query_log(),
+            file_name="query_log.jsonl",
+            mime="application/jsonl",
+            key="download_query_log",
+        )
+
+
+@fragment
 def render_option_manager():
+    # The filters and the case form pick up a new option on their next rerun.
     with st.expander("Manage dropdown options"):
         api_col, issue_col = st.columns(2)
         with api_col:
             st.markdown("**API options**")
-            st.write(", ".join(db.list_api_options()) or "—")
+            st.write(", ".join(run_data().api_options()) or "—")
             new_api = st.text_input("Add API option", key="new_api_option")
             if st.button("Save API option"):
                 if new_api.strip():
                     db.add_api_option(new_api.strip())
                     st.success(f"Added API option: {new_api.strip()}")
-                    st.rerun()
+                    rerun_fragment()
                 else:
                     st.warning("Provide a non-empty value.")
 
         with issue_col:
             st.markdown("**Issue options**")
-            st.write(", ".join(db.list_issue_options()) or "—")
+            st.write(", ".join(run_data().issue_options()) or "—")
             new_issue = st.text_input("Add issue type", key="new_issue_option")
             if st.button("Save issue type"):
                 if new_issue.strip():
                     db.add_issue_option(new_issue.strip())
                     st.success(f"Added issue type: {new_issue.strip()}")
-                    st.rerun()
+                    rerun_fragment()
                 else:
                     st.warning("Provide a non-empty value.")
 
 
-def render_case_details(case: Dict):
+def render_archive_manager():
+    with st.expander("Archive closed cases"):
+        st.caption(
+            "Moves completed and cancelled cases with no activity for the given "
+            "number of days, with their updates, to the archive database."
+        )
+        archive_cols = st.columns([2, 1])
+        days = archive_cols[0].number_input(
+            "Inactive for at least (days)",
+            min_value=0,
+            value=db.ARCHIVE_AFTER_DAYS,
+            step=30,
+        )
+        if archive_cols[1].button("Archive now", use_container_width=True):
+            archived = db.archive_closed_cases(int(days))
+            st.success(f"Archived {archived} case(s).")
+
+
+def render_case_details(case: Dict, archived: bool = False):
     st.markdown("##### Selected Case Details")
     info_cols = st.columns(4)
     info_cols[0].metric("Case ID", case["case_id"])
@@ -308,27 +653,43 @@ def render_case_details(case: Dict):
         )
         st.table(details_table)
 
+    if archived:
+        st.caption("This case is archived and read-only.")
+        return
+
     button_cols = st.columns(3)
     if button_cols[0].button("Edit case", use_container_width=True):
         st.session_state.edit_case_id = case["case_id"]
         st.session_state.show_case_form = True
 
-    if button_cols[1].button("Manage updates", use_container_width=True):
-        st.session_state.updates_case_filter = case["case_id"]
-        st.session_state.selected_update_case = case["case_id"]
-        st.experimental_set_query_params(tab="Updates")
+    if button_cols[1].button(
+        "Manage updates",
+        use_container_width=True,
+        on_click=open_case_updates,
+        args=(case["case_id"],),
+    ):
+        # Switching views needs the whole app, not just this fragment.
+        st.rerun()
 
     if button_cols[2].button("Delete case", use_container_width=True):
         db.delete_case(case["case_id"])
         st.success(f"Deleted case {case['case_id']}")
         st.session_state.selected_case_id = None
-        st.rerun()
+        rerun_fragment()
+
+
+def open_case_updates(case_id: str):
+    # A button callback: it runs before the rerun, while the view radio's
+    # state may still be changed.
+    st.session_state.updates_case_filter = case_id
+    st.session_state.selected_update_case = case_id
+    st.session_state.active_view = "Updates"
 
 
 def render_case_form(case: Optional[Dict]):
     st.markdown("#### Case Form")
-    api_options = db.list_api_options()
-    issue_options = db.list_issue_options()
+    api_options = run_data().api_options()
+    issue_options = run_data().issue_options()
 
     form_key = "edit_case_form" if case else "add_case_form"
     with st.form(key=form_key):
@@ -487,14 +848,14 @@ def render_case_form(case: Optional[Dict]):
                 st.error(f"Unable to save case: {exc}")
             finally:
                 st.session_state.show_case_form = False
-                st.rerun()
+                rerun_fragment()
 
 
+@fragment
 def render_updates_tab():
     st.subheader("Updates")
 
-    cases = db.list_cases()
-    case_ids = ["All"] + [case["case_id"] for case in cases]
+    case_ids = ["All"] + run_data().case_ids()
 
     if st.session_state.updates_case_filter != "All":
         try:
@@ -515,11 +876,46 @@ def render_updates_tab():
         if st.session_state.updates_case_filter == "All"
         else st.session_state.updates_case_filter
     )
-    updates = db.list_updates(current_case_id)
+    sort_cols = st.columns([2, 1, 1])
+    sort_by = sort_cols[0].selectbox(
+        "Sort by",
+        options=list(UPDATE_SORT_LABELS),
+        format_func=UPDATE_SORT_LABELS.get,
+        **kept("updates_sort_by"),
+    )
+    descending = sort_cols[1].selectbox(
+        "Order", options=["Descending", "Ascending"], **kept("updates_sort_order")
+    ) == "Descending"
+    page_size = sort_cols[2].selectbox(
+        "Rows per page",
+        options=PAGE_SIZES,
+        **kept("updates_page_size", PAGE_SIZES[1]),
+    )
 
-    if updates:
-        updates_df = pd.DataFrame(updates)
+    # The same setting as the Cases view's toggle; only one view is drawn
+    # per run, so the two checkboxes can share its key.
+    include_archived = st.checkbox(
+        "Include archived updates", **kept("include_archived")
+    )
+    cursor = _page_cursor(
+        "updates_pager",
+        [current_case_id, sort_by, descending, page_size, include_archived],
+    )
+    page = db.list_updates_page(
+        current_case_id,
+        page_size=page_size,
+        sort_by=sort_by,
+        descending=descending,
+        cursor=cursor,
+        with_total=True,
+        as_frame=True,
+        include_archived=include_archived,
+    )
+    updates_df = page.rows
+
+    if not updates_df.empty:
         st.dataframe(updates_df, use_container_width=True, hide_index=True)
+        render_pager("updates_pager", page, page_size, "updates")
     else:
         st.info("No updates found for the selected filter.")
 
@@ -532,27 +928,18 @@ def render_updates_tab():
     if st.session_state.show_update_form:
         update_to_edit = None
         if st.session_state.edit_update_id:
-            update_to_edit = next(
-                (
-                    upd
-                    for upd in updates
-                    if upd["id"] == st.session_state.edit_update_id
-                ),
-                None,
-            )
+            update_to_edit = db.get_update(st.session_state.edit_update_id)
         render_update_form(update_to_edit, st.session_state.selected_update_case)
 
     st.markdown("#### Update Actions")
-    if updates:
-        ids = [u["id"] for u in updates]
+    if not updates_df.empty:
+        ids = updates_df["id"].tolist()
         selected_update_id = st.selectbox(
             "Select update",
             options=[""] + ids,
         )
         if selected_update_id:
-            selected = next(
-                (u for u in updates if u["id"] == selected_update_id), None
-            )
+            selected = db.get_update(selected_update_id)
             if selected:
                 st.json(selected, expanded=False)
                 action_cols = st.columns(2)
@@ -565,7 +952,7 @@ def render_updates_tab():
                 ):
                     db.delete_update(selected_update_id)
                     st.success(f"Deleted update {selected_update_id}")
-                    st.rerun()
+                    rerun_fragment()
 
 
 def render_update_form(
@@ -573,8 +960,7 @@ def render_update_form(
 ):
     st.markdown("#### Update Form")
 
-    cases = db.list_cases()
-    case_ids = [case["case_id"] for case in cases]
+    case_ids = run_data().case_ids()
 
     with st.form(key="update_form"):
         case_id = st.selectbox(
@@ -638,43 +1024,113 @@ def render_update_form(
             finally:
                 st.session_state.show_update_form = False
                 st.session_state.edit_update_id = None
-                st.rerun()
+                rerun_fragment()
 
 
-def import_cases_from_excel(file):
-    try:
-        cases, updates = excel_utils.parse_import_workbook(file)
-    except Exception as exc:
-        st.error(f"Import failed: {exc}")
-        return
+@st.cache_resource
+def export_cache() -> excel_utils.ExportCache:
+    return excel_utils.ExportCache()
 
-    created_cases = 0
-    skipped_cases = 0
-    created_updates = 0
-    skipped_updates = 0
-
-    for case in cases:
-        existing = db.get_case(case["case_id"])
-        if existing:
-            skipped_cases += 1
-            continue
-        db.create_case(case)
-        created_cases += 1
-
-    for update in updates:
-        if update["case_id"] and db.get_case(update["case_id"]):
-            try:
-                db.create_update(update)
-                created_updates += 1
-            except Exception:
-                skipped_updates += 1
+
+def render_job_status(container, job: Dict[str, Any], noun: str):
+    stage = (job["stage"] or job["status"]).capitalize()
+    container.info(
+        f"{noun} job #{job['id']}: {stage} — {job['rows_processed']:,} rows so far."
+    )
+    container.button(
+        "🔄 Refresh status", key=f"refresh_job_{job['id']}", use_container_width=True
+    )
+
+
+def render_import_job():
+    job_id = st.session_state.import_job_id
+    job = db.get_job(job_id) if job_id else None
+    if not job:
+        return
+    noun = "Check" if job["kind"] == "validate" else "Import"
+    if job["status"] in ("queued", "running"):
+        render_job_status(st, job, noun)
+        return
+    if job["status"] == "failed":
+        st.error(f"{noun} failed: {job['error']}")
+    elif job["kind"] == "validate":
+        summary = job["result"]
+        message = (
+            f"Checked {summary['rows']:,} rows — {summary['errors']:,} errors, "
+            f"{summary['warnings']:,} warnings."
+        )
+        if summary["errors"]:
+            st.error(message)
+        elif summary["warnings"]:
+            st.warning(message)
         else:
-            skipped_updates += 1
+            st.success(message)
+    else:
+        counts = job["result"]
+        st.success(
+            "Import complete — "
+            + "; ".join(
+                f"{entity}: {counts[f'created_{entity}']} created, "
+                f"{counts[f'updated_{entity}']} updated, "
+                f"{counts[f'unchanged_{entity}']} unchanged, "
+                f"{counts[f'skipped_{entity}']} skipped"
+                for entity in ("cases", "updates")
+            )
+            + (f" ({counts['warnings']:,} warnings)" if "warnings" in counts else "")
+            + "."
+        )
+    if job["artifact_path"] and Path(job["artifact_path"]).exists():
+        report = Path(job["artifact_path"])
+        st.download_button(
+            "⬇️ Download annotated issue report",
+            data=report.read_bytes(),
+            file_name=report.name,
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            key=f"import_report_{job['id']}",
+        )
+
+
+def _page_cursor(state_key: str, signature: Any) -> Optional[Any]:
+    """Return the keyset cursor for the current page of a paged table.
 
-    st.success(
-        f"Import complete — cases: {created_cases} created, {skipped_cases} skipped; "
-        f"updates: {created_updates} created, {skipped_updates} skipped."
+    The stack of visited cursors is reset whenever ``signature`` (filters,
+    sort and page size) changes, so a new query always starts on page one.
+    """
+    signature = json.dumps(signature, sort_keys=True, default=str)
+    state = st.session_state.setdefault(
+        state_key, {"signature": signature, "cursors": [None]}
     )
+    if state["signature"] != signature:
+        state["signature"] = signature
+        state["cursors"] = [None]
+    return state["cursors"][-1]
+
+
+def render_pager(state_key: str, page: db.Page, page_size: int, noun: str):
+    state = st.session_state[state_key]
+    page_number = len(state["cursors"])
+    pager_cols = st.columns([1, 1, 4])
+    if pager_cols[0].button(
+        "◀ Previous",
+        key=f"{state_key}_prev",
+        disabled=page_number == 1,
+        use_container_width=True,
+    ):
+        state["cursors"].pop()
+        rerun_fragment()
+    if pager_cols[1].button(
+        "Next ▶",
+        key=f"{state_key}_next",
+        disabled=page.next_cursor is None,
+        use_container_width=True,
+    ):
+        state["cursors"].append(page.next_cursor)
+        rerun_fragment()
+    if page.total is not None:
+        page_count = max(1, -(-page.total // page_size))
+        pager_cols[2].caption(
+            f"Page {page_number} of {page_count} · {page.total} {noun}"
+        )
 
 
 def _to_date(value: Optional[str]) -> date:
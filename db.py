@@ -1,10 +1,112 @@
+import atexit
+import functools
+import hashlib
 import json
+import os
+import queue
 import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
 from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import pandas as pd
 
 DB_PATH = Path("case_mgmt.db")
+DB_POOL_SIZE = int(os.environ.get("CASE_MGMT_DB_POOL_SIZE", "8"))
+DB_POOL_TIMEOUT = 30.0
+WRITER_MAX_BATCH_SIZE = 64
+WRITER_MAX_LATENCY = 0.005
+QUERY_LOG_CAPACITY = 5000
+SLOW_QUERY_MS = float(os.environ.get("CASE_MGMT_SLOW_QUERY_MS", "100"))
+READ_CACHE_MAX_ENTRIES = int(os.environ.get("CASE_MGMT_READ_CACHE_ENTRIES", "256"))
+READ_CACHE_MAX_ROWS = int(os.environ.get("CASE_MGMT_READ_CACHE_ROWS", "200000"))
+CHANGE_POLL_INTERVAL = float(os.environ.get("CASE_MGMT_CHANGE_POLL_MS", "500")) / 1000
+
+# Closed cases are moved to a separate SQLite file attached to every
+# connection as the "archive" schema. ARCHIVE_DB_PATH defaults to
+# "<db name>_archive<suffix>" next to DB_PATH.
+ARCHIVE_DB_PATH: Optional[Path] = None
+ARCHIVE_AFTER_DAYS = int(os.environ.get("CASE_MGMT_ARCHIVE_AFTER_DAYS", "180"))
+ARCHIVE_BATCH_SIZE = 500
+CLOSED_CASE_STATUSES = ("COMPLETED", "CANCELLED")
+
+IMPORT_MODES = ("skip", "merge")
+IMPORT_CHUNK_SIZE = 5000
+SQL_PARAM_CHUNK = 500
+
+# Columns searchable through the case filter form ("contains" filters).
+CASE_TEXT_COLUMNS = (
+    "case_id",
+    "case_status",
+    "last_sub_status",
+    "seller_name",
+    "specialist_name",
+    "marketplace",
+    "workstream",
+    "priority",
+    "issue_type",
+)
+
+# Columns the case and update tables can be sorted on. Every case sort
+# column has a matching (column COLLATE NOCASE, case_id) index.
+CASE_SORT_COLUMNS = (
+    "case_id",
+    "seller_name",
+    "specialist_name",
+    "marketplace",
+    "case_status",
+    "workstream",
+    "priority",
+)
+UPDATE_SORT_COLUMNS = {
+    "timestamp": "ts_epoch",
+    "id": "id",
+}
+DEFAULT_PAGE_SIZE = 50
+# Rows fetched per page by the *_frame readers.
+FRAME_PAGE_SIZE = 5000
+
+# Multi-valued case fields: dict key -> (junction table, option table). The
+# junction tables are the source of truth; the matching ``cases`` column
+# keeps a ", "-joined copy for the "contains" filter and for display.
+CASE_LIST_FIELDS = {
+    "issue_type": ("case_issue_types", "issue_options"),
+    "api_supported": ("case_api_supported", "api_options"),
+}
+_LIST_SEPARATOR = "\x1f"
+
+# Low-cardinality columns returned as pandas categoricals by the *_frame
+# readers.
+CASE_CATEGORY_COLUMNS = (
+    "marketplace",
+    "case_source",
+    "case_status",
+    "workstream",
+    "complexity",
+    "priority",
+    "seller_type",
+    "last_sub_status",
+)
+UPDATE_CATEGORY_COLUMNS = ("sub_status",)
 
 DEFAULT_API_OPTIONS = [
     "REST API",
@@ -24,306 +126,2944 @@ DEFAULT_ISSUE_OPTIONS = [
 ]
 
 
-@contextmanager
-def get_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+T = TypeVar("T")
+
+
+class QueryLog:
+    """In-process record of executed statements, for profiling reruns.
+
+    Keeps the last ``capacity`` statements with their call site (the
+    innermost public ``db`` function), row count and latency including
+    fetches. Statements slower than ``slow_ms`` are also kept in a separate
+    slow log together with their ``EXPLAIN QUERY PLAN``.
+    """
+
+    def __init__(
+        self, capacity: int = QUERY_LOG_CAPACITY, slow_ms: float = SLOW_QUERY_MS
+    ):
+        self.slow_ms = slow_ms
+        self.records: "deque[Dict[str, Any]]" = deque(maxlen=capacity)
+        self.slow: "deque[Dict[str, Any]]" = deque(maxlen=capacity)
+
+    def start(self, sql: str, many: bool) -> Dict[str, Any]:
+        record = {
+            "started_at": time.time(),
+            "site": _call_site(),
+            "sql": " ".join(sql.split()),
+            "many": many,
+            "rows": 0,
+            "elapsed_ms": 0.0,
+            "plan": None,
+        }
+        self.records.append(record)
+        return record
+
+    def add(
+        self,
+        record: Dict[str, Any],
+        elapsed: float,
+        rows: int,
+        conn: sqlite3.Connection,
+        sql: str,
+        params: Any,
+    ) -> None:
+        record["elapsed_ms"] += elapsed * 1000
+        record["rows"] += rows
+        if record["plan"] is None and record["elapsed_ms"] >= self.slow_ms:
+            record["plan"] = _capture_plan(conn, sql, params)
+            self.slow.append(record)
+
+
+_query_log: Optional[QueryLog] = None
+_write_site = threading.local()
+# Public helpers that never count as a call site themselves.
+_PLUMBING = ("run_write", "get_connection")
+
+
+def _call_site() -> str:
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename == __file__:
+            name = getattr(code, "co_qualname", code.co_name).split(".<locals>")[0]
+            if not name.startswith("_") and "." not in name and name not in _PLUMBING:
+                return name
+        frame = frame.f_back
+    return getattr(_write_site, "name", None) or "<unknown>"
+
+
+def _capture_plan(conn: sqlite3.Connection, sql: str, params: Any) -> List[str]:
+    if params is None:
+        return []
     try:
+        rows = sqlite3.Connection.execute(
+            conn, f"EXPLAIN QUERY PLAN {sql}", params
+        ).fetchall()
+    except sqlite3.Error as exc:
+        return [f"<plan unavailable: {exc}>"]
+    return [row[-1] for row in rows]
+
+
+class _InstrumentedCursor(sqlite3.Cursor):
+    _record: Optional[Dict[str, Any]] = None
+    _sql = ""
+    _params: Any = None
+
+    def execute(self, sql: str, parameters: Any = (), /):
+        log = _query_log
+        if log is None:
+            self._record = None
+            return super().execute(sql, parameters)
+        self._record = log.start(sql, many=False)
+        self._sql, self._params = sql, parameters
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._fetched(start, self.rowcount if self.description is None else 0)
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /):
+        log = _query_log
+        if log is None:
+            self._record = None
+            return super().executemany(sql, seq_of_parameters)
+        self._record = log.start(sql, many=True)
+        self._sql, self._params = sql, None
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._fetched(start, self.rowcount)
+
+    def _fetched(self, start: float, rows: int) -> None:
+        log = _query_log
+        if log is not None and self._record is not None:
+            log.add(
+                self._record,
+                time.perf_counter() - start,
+                max(rows, 0),
+                self.connection,
+                self._sql,
+                self._params,
+            )
+
+    def fetchone(self):
+        if self._record is None:
+            return super().fetchone()
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(start, row is not None)
+        return row
+
+    def fetchmany(self, size: int = -1):
+        if self._record is None:
+            return super().fetchmany(size if size >= 0 else self.arraysize)
+        start = time.perf_counter()
+        rows = super().fetchmany(size if size >= 0 else self.arraysize)
+        self._fetched(start, len(rows))
+        return rows
+
+    def fetchall(self):
+        if self._record is None:
+            return super().fetchall()
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(start, len(rows))
+        return rows
+
+    def __next__(self):
+        if self._record is None:
+            return super().__next__()
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(start, 0)
+            raise
+        self._fetched(start, 1)
+        return row
+
+
+class _InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors report to the query log.
+
+    Only opened while the log is enabled; plain connections skip the extra
+    Python call per ``execute`` and fetch. Its cursors still check the log on
+    every statement, as a connection can outlive ``disable_query_log``.
+    """
+
+    def cursor(self, factory: Any = None):
+        return super().cursor(factory or _InstrumentedCursor)
+
+    def execute(self, sql: str, parameters: Any = (), /):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def enable_query_log(
+    slow_ms: float = SLOW_QUERY_MS, capacity: int = QUERY_LOG_CAPACITY
+) -> QueryLog:
+    global _query_log
+    was_enabled = _query_log is not None
+    _query_log = QueryLog(capacity, slow_ms)
+    if not was_enabled:
+        _reopen_connections()
+    return _query_log
+
+
+def disable_query_log() -> None:
+    global _query_log
+    if _query_log is not None:
+        _query_log = None
+        _reopen_connections()
+
+
+def _reopen_connections() -> None:
+    """Drop pooled and writer connections so the next ones are opened with
+    the connection class matching the query log setting."""
+    close_pool()
+    close_writer()
+
+
+def query_log_enabled() -> bool:
+    return _query_log is not None
+
+
+def query_log_records(slow_only: bool = False) -> List[Dict[str, Any]]:
+    log = _query_log
+    if log is None:
+        return []
+    return [dict(record) for record in (log.slow if slow_only else log.records)]
+
+
+def export_query_log(slow_only: bool = False) -> str:
+    """Return the recorded statements as JSON lines."""
+    return "".join(
+        json.dumps(record, default=str) + "\n"
+        for record in query_log_records(slow_only)
+    )
+
+
+def query_log_summary() -> List[Dict[str, Any]]:
+    """Per call site: statement count, rows, total and p50/p95/p99 latency."""
+    by_site: Dict[str, List[Dict[str, Any]]] = {}
+    for record in query_log_records():
+        by_site.setdefault(record["site"], []).append(record)
+
+    summary = []
+    for site, records in by_site.items():
+        latencies = sorted(record["elapsed_ms"] for record in records)
+        summary.append(
+            {
+                "site": site,
+                "calls": len(records),
+                "rows": sum(record["rows"] for record in records),
+                "total_ms": round(sum(latencies), 3),
+                "p50_ms": round(_percentile(latencies, 50), 3),
+                "p95_ms": round(_percentile(latencies, 95), 3),
+                "p99_ms": round(_percentile(latencies, 99), 3),
+            }
+        )
+    summary.sort(key=lambda row: row["total_ms"], reverse=True)
+    return summary
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    rank = max(0, -(-len(ordered) * pct // 100) - 1)
+    return ordered[int(rank)]
+
+
+if os.environ.get("CASE_MGMT_SQL_LOG"):
+    enable_query_log()
+
+
+def _open_connection(path: Path, timeout: float) -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        path,
+        timeout=timeout,
+        check_same_thread=False,
+        factory=_InstrumentedConnection
+        if _query_log is not None
+        else sqlite3.Connection,
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("ATTACH DATABASE ? AS archive", (str(archive_path(path)),))
+    conn.execute("PRAGMA archive.journal_mode=WAL")
+    return conn
+
+
+def archive_path(path: Optional[Path] = None) -> Path:
+    if ARCHIVE_DB_PATH is not None:
+        return Path(ARCHIVE_DB_PATH)
+    path = Path(path or DB_PATH)
+    return path.with_name(f"{path.stem}_archive{path.suffix}")
+
+
+class ConnectionPool:
+    """Bounded pool of long-lived SQLite connections.
+
+    A thread keeps the connection it checked out for the whole outermost
+    ``connection()`` block, so nested calls share one connection and one
+    transaction. Idle connections are handed out most-recently-used first and
+    are health checked before reuse.
+    """
+
+    def __init__(
+        self, path: Path, size: int = DB_POOL_SIZE, timeout: float = DB_POOL_TIMEOUT
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open: Set[sqlite3.Connection] = set()
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = _open_connection(self.path, self.timeout)
+        with self._lock:
+            self._open.add(conn)
+        return conn
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            self._open.discard(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @staticmethod
+    def _is_healthy(conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+        except sqlite3.Error:
+            return False
+        return True
+
+    def _checkout(self) -> sqlite3.Connection:
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(
+                f"No database connection available after {self.timeout}s "
+                f"(pool size {self.size})."
+            )
+        try:
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+                if self._is_healthy(conn):
+                    return conn
+                self._discard(conn)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _checkin(self, conn: sqlite3.Connection) -> None:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            if self._closed:
+                self._discard(conn)
+            else:
+                self._idle.put(conn)
+        except sqlite3.Error:
+            self._discard(conn)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            yield held
+            return
+
+        conn = self._checkout()
+        self._local.conn = conn
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            self._checkin(conn)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+_search_index_paths: Dict[str, bool] = {}
+
+
+def _get_pool() -> ConnectionPool:
+    global _pool
+    pool = _pool
+    if pool is not None and pool.path == DB_PATH:
+        return pool
+    with _pool_lock:
+        if _pool is None or _pool.path != DB_PATH:
+            if _pool is not None:
+                _pool.close()
+            _pool = ConnectionPool(DB_PATH, DB_POOL_SIZE, DB_POOL_TIMEOUT)
+        return _pool
+
+
+def configure_pool(size: int, timeout: Optional[float] = None) -> None:
+    global DB_POOL_SIZE, DB_POOL_TIMEOUT, _pool
+    if size < 1:
+        raise ValueError("Pool size must be at least 1.")
+    with _pool_lock:
+        DB_POOL_SIZE = size
+        if timeout is not None:
+            DB_POOL_TIMEOUT = timeout
+        if _pool is not None:
+            _pool.close()
+        _pool = ConnectionPool(DB_PATH, DB_POOL_SIZE, DB_POOL_TIMEOUT)
+
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+@contextmanager
+def get_connection() -> Iterator[sqlite3.Connection]:
+    with _get_pool().connection() as conn:
         yield conn
-        conn.commit()
-    finally:
-        conn.close()
 
 
-def init_db() -> None:
+class _WriteRequest(NamedTuple):
+    work: Callable[[sqlite3.Connection], Any]
+    future: Future
+    site: Optional[str] = None
+    # Whether committing this request invalidates the read cache.
+    invalidate: bool = True
+
+
+class WriteQueue:
+    """Single writer thread that applies queued writes with group commit.
+
+    Callers submit ``work(conn)`` callables and wait on the returned future.
+    The writer drains up to ``max_batch_size`` requests, waiting at most
+    ``max_latency`` seconds for more to arrive, and runs them in one
+    transaction. Each request runs in its own savepoint, so a failing one is
+    rolled back and reported to its caller without affecting the others.
+
+    The writer also detects commits made by other connections, notably
+    other processes sharing the file: before each batch, and every
+    ``poll_interval`` seconds while idle, it checks ``PRAGMA data_version``
+    of both schemas on its connection and advances ``data_token()`` when
+    they moved. Its own commits never move them, so they are not counted
+    twice.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_batch_size: int = WRITER_MAX_BATCH_SIZE,
+        max_latency: float = WRITER_MAX_LATENCY,
+        poll_interval: float = CHANGE_POLL_INTERVAL,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("Writer batch size must be at least 1.")
+        self.path = path
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.poll_interval = poll_interval
+        self._queue: "queue.Queue[Optional[_WriteRequest]]" = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="db-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self,
+        work: Callable[[sqlite3.Connection], T],
+        site: Optional[str] = None,
+        invalidate: bool = True,
+    ) -> "Future[T]":
+        future: "Future[T]" = Future()
+        self._queue.put(_WriteRequest(work, future, site, invalidate))
+        return future
+
+    def close(self) -> None:
+        self._queue.put(None)
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+
+    def _run(self) -> None:
+        conn = _open_connection(self.path, DB_POOL_TIMEOUT)
+        versions = _data_versions(conn)
+        try:
+            while True:
+                versions = self._check_versions(conn, versions)
+                try:
+                    first = self._queue.get(timeout=self.poll_interval)
+                except queue.Empty:
+                    continue
+                if first is None:
+                    return
+                batch = [first]
+                stop = self._fill_batch(batch)
+                self._apply(conn, batch)
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _check_versions(
+        conn: sqlite3.Connection, versions: Tuple[int, ...]
+    ) -> Tuple[int, ...]:
+        try:
+            current = _data_versions(conn)
+        except sqlite3.Error:
+            # Busy or briefly unreadable; the next check catches up.
+            return versions
+        if current != versions:
+            _bump_generation()
+        return current
+
+    def _fill_batch(self, batch: List[_WriteRequest]) -> bool:
+        deadline = time.monotonic() + self.max_latency
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    request = self._queue.get(timeout=remaining)
+                else:
+                    request = self._queue.get_nowait()
+            except queue.Empty:
+                return False
+            if request is None:
+                return True
+            batch.append(request)
+        return False
+
+    def _apply(self, conn: sqlite3.Connection, batch: List[_WriteRequest]) -> None:
+        outcomes: List[Tuple[_WriteRequest, Any, Optional[BaseException]]] = []
+        try:
+            _write_site.name = "group_commit"
+            conn.execute("BEGIN IMMEDIATE")
+            for request in batch:
+                if not request.future.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT write_request")
+                _write_site.name = request.site
+                try:
+                    result = request.work(conn)
+                except BaseException as exc:
+                    _write_site.name = "group_commit"
+                    conn.execute("ROLLBACK TO write_request")
+                    conn.execute("RELEASE write_request")
+                    outcomes.append((request, None, exc))
+                else:
+                    _write_site.name = "group_commit"
+                    conn.execute("RELEASE write_request")
+                    outcomes.append((request, result, None))
+            _write_site.name = None
+            conn.commit()
+            # Before any caller is released, so a read after run_write()
+            # returns can never be served from before the write.
+            if any(request.invalidate for request, _, error in outcomes if not error):
+                _bump_generation()
+        except BaseException as exc:
+            _write_site.name = None
+            if conn.in_transaction:
+                conn.rollback()
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(exc)
+            return
+
+        for request, result, error in outcomes:
+            if error is not None:
+                request.future.set_exception(error)
+            else:
+                request.future.set_result(result)
+
+
+_writer: Optional[WriteQueue] = None
+_writer_lock = threading.Lock()
+
+
+def _get_writer() -> WriteQueue:
+    global _writer
+    writer = _writer
+    if writer is not None and writer.path == DB_PATH:
+        return writer
+    with _writer_lock:
+        if _writer is None or _writer.path != DB_PATH:
+            if _writer is not None:
+                _writer.close()
+            _writer = WriteQueue(DB_PATH, WRITER_MAX_BATCH_SIZE, WRITER_MAX_LATENCY)
+        return _writer
+
+
+def configure_writer(
+    max_batch_size: Optional[int] = None, max_latency: Optional[float] = None
+) -> None:
+    global WRITER_MAX_BATCH_SIZE, WRITER_MAX_LATENCY, _writer
+    with _writer_lock:
+        if max_batch_size is not None:
+            WRITER_MAX_BATCH_SIZE = max_batch_size
+        if max_latency is not None:
+            WRITER_MAX_LATENCY = max_latency
+        if _writer is not None:
+            _writer.close()
+        _writer = WriteQueue(DB_PATH, WRITER_MAX_BATCH_SIZE, WRITER_MAX_LATENCY)
+
+
+def close_writer() -> None:
+    global _writer
+    with _writer_lock:
+        if _writer is not None:
+            _writer.close()
+            _writer = None
+
+
+atexit.register(close_writer)
+
+
+def run_write(work: Callable[[sqlite3.Connection], T], invalidate: bool = True) -> T:
+    """Run ``work(conn)`` on the writer thread and return its result.
+
+    Exceptions raised by ``work`` (or by the commit) are re-raised here.
+    Pass ``invalidate=False`` only for writes no cached read depends on
+    (job bookkeeping); see ``ReadCache``.
+    """
+    writer = _get_writer()
+    if threading.current_thread() is writer._thread:
+        raise RuntimeError("run_write cannot be called from a write request.")
+    site = _call_site() if _query_log is not None else None
+    return writer.submit(work, site, invalidate).result()
+
+
+def _write_statement(query: str, params: Any = (), invalidate: bool = True) -> int:
+    return run_write(lambda conn: conn.execute(query, params).rowcount, invalidate)
+
+
+_write_generation = 0
+_generation_lock = threading.Lock()
+
+
+def _bump_generation() -> None:
+    global _write_generation
+    with _generation_lock:
+        _write_generation += 1
+
+
+def _data_versions(conn: sqlite3.Connection) -> Tuple[int, ...]:
+    # Bypasses the query log: this runs on every writer poll.
+    return tuple(
+        sqlite3.Connection.execute(conn, f"PRAGMA {schema}.data_version").fetchone()[0]
+        for schema in ("main", "archive")
+    )
+
+
+def data_token() -> int:
+    """A number that increases whenever the database may have changed.
+
+    Advanced by every write committed in this process and, within
+    ``CHANGE_POLL_INTERVAL``, by commits from other processes. Caches keyed
+    on it (like ``ReadCache``) only reload after an actual write. Tokens
+    are per process and not comparable across processes.
+    """
+    # The writer thread is what notices other processes' commits.
+    _get_writer()
+    return _write_generation
+
+
+class ReadCache:
+    """Results of the cached db read functions, shared by every session in
+    the process.
+
+    Entries belong to a write generation, the ``data_token()``: every
+    committed write request bumps it, as do commits by
+    other processes, and the first lookup after that drops everything
+    cached before it. Least recently used entries are
+    evicted beyond ``max_entries`` or once the cached results hold more than
+    ``max_rows`` rows; a result larger than that is not kept.
+
+    Cached results are shared between callers and must not be mutated.
+    """
+
+    _MISSING = object()
+
+    def __init__(
+        self,
+        max_entries: int = READ_CACHE_MAX_ENTRIES,
+        max_rows: int = READ_CACHE_MAX_ROWS,
+    ):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[Any, int]]" = OrderedDict()
+        self._rows = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[Any, ...], generation: int) -> Any:
+        """Return the cached value or ``ReadCache._MISSING``."""
+        with self._lock:
+            self._sync(generation)
+            entry = self._entries.get(key)
+            if entry is None:
+                return self._MISSING
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Tuple[Any, ...], generation: int, value: Any) -> None:
+        rows = _result_rows(value)
+        with self._lock:
+            self._sync(generation)
+            if generation != self._generation or rows > self.max_rows:
+                return
+            if key in self._entries:
+                self._rows -= self._entries.pop(key)[1]
+            self._entries[key] = (value, rows)
+            self._rows += rows
+            while len(self._entries) > self.max_entries or self._rows > self.max_rows:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._rows -= evicted
+
+    def _sync(self, generation: int) -> None:
+        if generation > self._generation:
+            self._entries.clear()
+            self._rows = 0
+            self._generation = generation
+
+
+def _result_rows(value: Any) -> int:
+    rows = value.rows if isinstance(value, Page) else value
+    if isinstance(rows, (list, pd.DataFrame)):
+        return max(len(rows), 1)
+    return 1
+
+
+_read_cache = ReadCache()
+
+
+def _cached_read(func: Callable[..., T]) -> Callable[..., T]:
+    """Serve ``func`` from the read cache, keyed by its arguments."""
+
+    @functools.wraps(func)
+    def cached(*args: Any, **kwargs: Any) -> T:
+        # Read before querying: a write landing mid-query moves the
+        # token on, so a result that may predate it is never served.
+        generation = data_token()
+        key = (
+            func.__name__,
+            str(DB_PATH),
+            json.dumps([args, kwargs], sort_keys=True, default=repr),
+        )
+        value = _read_cache.get(key, generation)
+        if value is ReadCache._MISSING:
+            value = func(*args, **kwargs)
+            _read_cache.put(key, generation, value)
+        return value
+
+    return cached
+
+
+def _execute_script(conn: sqlite3.Connection, script: str) -> None:
+    """Run the statements of ``script`` one by one.
+
+    Unlike ``executescript``, which commits first, this keeps them inside
+    the current transaction, so a migration applies all or nothing.
+    """
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            conn.execute(statement)
+            statement = ""
+    if statement.strip():
+        conn.execute(statement)
+
+
+def _create_base_tables(conn: sqlite3.Connection) -> None:
+    _execute_script(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS cases (
+            case_id TEXT PRIMARY KEY,
+            seller_id INTEGER NOT NULL,
+            seller_name TEXT NOT NULL,
+            specialist_id TEXT NOT NULL,
+            specialist_name TEXT NOT NULL,
+            marketplace TEXT NOT NULL,
+            case_source TEXT NOT NULL,
+            case_status TEXT NOT NULL,
+            workstream TEXT NOT NULL,
+            listing_start_date TEXT,
+            listing_completion_date TEXT,
+            issue_type TEXT NOT NULL,
+            complexity TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            api_supported TEXT NOT NULL,
+            integration_type TEXT NOT NULL,
+            seller_type TEXT NOT NULL,
+            feedback_received INTEGER NOT NULL,
+            csat_score REAL,
+            notes TEXT,
+            last_sub_status TEXT
+        );
+
+        CREATE TABLE IF NOT EXISTS updates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            case_id TEXT NOT NULL,
+            note TEXT NOT NULL,
+            updated_by TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            sub_status TEXT NOT NULL,
+            ts_epoch INTEGER,
+            FOREIGN KEY (case_id) REFERENCES cases(case_id) ON DELETE CASCADE
+        );
+
+        CREATE TABLE IF NOT EXISTS api_options (
+            name TEXT PRIMARY KEY
+        );
+
+        CREATE TABLE IF NOT EXISTS issue_options (
+            name TEXT PRIMARY KEY
+        );
+        """,
+    )
+
+
+def _create_base_indexes(conn: sqlite3.Connection) -> None:
+    _ensure_column(conn, "updates", "ts_epoch", "INTEGER")
+    conn.execute(
+        f"""
+        UPDATE updates
+        SET ts_epoch = {_TS_EPOCH_SQL.format("timestamp")}
+        WHERE ts_epoch IS NULL
+        """
+    )
+    _execute_script(
+        conn,
+        """
+        CREATE INDEX IF NOT EXISTS idx_updates_case_ts
+            ON updates(case_id, ts_epoch DESC, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_updates_ts
+            ON updates(ts_epoch DESC, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_cases_case_id_nocase
+            ON cases(case_id COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS idx_cases_status ON cases(case_status);
+        """,
+    )
+    for column in CASE_SORT_COLUMNS[1:]:
+        conn.execute(
+            f"""
+            CREATE INDEX IF NOT EXISTS idx_cases_{column}_sort
+                ON cases({column} COLLATE NOCASE, case_id)
+            """
+        )
+
+
+def _create_order_indexes(conn: sqlite3.Connection) -> None:
+    """Indexes that serve the remaining ORDER BYs (see
+    ``verify_query_plans``): the case ID page order with its exact-case tie
+    break, updates of one case by ID, and list names by position."""
+    _execute_script(
+        conn,
+        """
+        CREATE INDEX IF NOT EXISTS idx_cases_case_id_sort
+            ON cases(case_id COLLATE NOCASE, case_id);
+        DROP INDEX IF EXISTS idx_cases_case_id_nocase;
+        CREATE INDEX IF NOT EXISTS idx_updates_case_id ON updates(case_id, id);
+        """,
+    )
+    for table, _ in CASE_LIST_FIELDS.values():
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_position "
+            f"ON {table}(case_id, position)"
+        )
+
+
+def _seed_default_options(conn: sqlite3.Connection) -> None:
+    for table, values in (
+        ("api_options", DEFAULT_API_OPTIONS),
+        ("issue_options", DEFAULT_ISSUE_OPTIONS),
+    ):
+        conn.executemany(
+            f"INSERT OR IGNORE INTO {table}(name) VALUES (?)",
+            [(value,) for value in values],
+        )
+
+
+_migrated: Set[Tuple[str, str]] = set()
+_migration_lock = threading.Lock()
+
+
+def init_db() -> None:
+    """Apply pending schema migrations, once per process and database.
+
+    The first call runs ``migrate_schema`` under a lock; later calls (every
+    Streamlit rerun) return without touching SQLite.
+    """
+    key = (str(DB_PATH), str(archive_path()))
+    if key in _migrated:
+        return
+    with _migration_lock:
+        if key not in _migrated:
+            migrate_schema()
+            _migrated.add(key)
+
+
+def migrate_schema() -> int:
+    """Bring the database (and its archive) up to the latest schema version
+    and return the number of migrations applied.
+
+    Runs as one write request, i.e. in one ``BEGIN IMMEDIATE`` transaction:
+    processes starting together take turns, and the second finds nothing
+    left to do. A failing migration rolls back with everything before it.
+    """
+
+    def migrate(conn: sqlite3.Connection) -> int:
+        latest = len(SCHEMA_MIGRATIONS)
+        version = conn.execute("PRAGMA main.user_version").fetchone()[0]
+        if version > latest:
+            raise RuntimeError(
+                f"Database schema version {version} is newer than this app "
+                f"supports ({latest})."
+            )
+        for migration in SCHEMA_MIGRATIONS[version:]:
+            migration(conn)
+        archived = conn.execute("PRAGMA archive.user_version").fetchone()[0]
+        if version < latest or archived != latest:
+            # The archive mirrors the case tables, including new columns.
+            _create_archive_tables(conn)
+        conn.execute(f"PRAGMA main.user_version = {latest}")
+        conn.execute(f"PRAGMA archive.user_version = {latest}")
+        return latest - version
+
+    return run_write(migrate)
+
+
+def _create_search_index(conn: sqlite3.Connection) -> None:
+    """Create the trigram index behind the case "contains" filters.
+
+    ``cases_fts`` is an external-content FTS5 table over ``cases`` kept in
+    sync by triggers. It is skipped when SQLite lacks FTS5 or the trigram
+    tokenizer, in which case filters fall back to plain LIKE scans.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'cases_fts'"
+    ).fetchone()
+    if not exists:
+        columns = ", ".join(CASE_TEXT_COLUMNS)
+        try:
+            conn.execute(
+                f"""
+                CREATE VIRTUAL TABLE cases_fts USING fts5(
+                    {columns},
+                    content='cases', content_rowid='rowid', tokenize='trigram'
+                )
+                """
+            )
+        except sqlite3.OperationalError:
+            return
+        conn.execute("INSERT INTO cases_fts(cases_fts) VALUES ('rebuild')")
+
+    new_values = ", ".join(f"new.{column}" for column in CASE_TEXT_COLUMNS)
+    old_values = ", ".join(f"old.{column}" for column in CASE_TEXT_COLUMNS)
+    columns = ", ".join(CASE_TEXT_COLUMNS)
+    _execute_script(
+        conn,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS cases_fts_insert AFTER INSERT ON cases BEGIN
+            INSERT INTO cases_fts(rowid, {columns}) VALUES (new.rowid, {new_values});
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS cases_fts_delete AFTER DELETE ON cases BEGIN
+            INSERT INTO cases_fts(cases_fts, rowid, {columns})
+            VALUES ('delete', old.rowid, {old_values});
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS cases_fts_update
+        AFTER UPDATE OF {columns} ON cases BEGIN
+            INSERT INTO cases_fts(cases_fts, rowid, {columns})
+            VALUES ('delete', old.rowid, {old_values});
+            INSERT INTO cases_fts(rowid, {columns}) VALUES (new.rowid, {new_values});
+        END;
+        """,
+    )
+
+
+def _create_case_list_tables(conn: sqlite3.Connection) -> None:
+    """Create the issue type / supported API junction tables.
+
+    The first time they are created, the JSON lists stored in ``cases`` are
+    moved into them and the ``cases`` columns are rewritten as joined text.
+    """
+    migrate = False
+    for field, (table, option_table) in CASE_LIST_FIELDS.items():
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = ?", (table,)
+        ).fetchone()
+        migrate = migrate or not exists
+        _execute_script(
+            conn,
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                case_id TEXT NOT NULL
+                    REFERENCES cases(case_id) ON DELETE CASCADE,
+                name TEXT NOT NULL
+                    REFERENCES {option_table}(name) ON UPDATE CASCADE,
+                position INTEGER NOT NULL,
+                PRIMARY KEY (case_id, name)
+            ) WITHOUT ROWID;
+
+            CREATE INDEX IF NOT EXISTS idx_{table}_name ON {table}(name, case_id);
+            """,
+        )
+
+    if not migrate:
+        return
+    rows = conn.execute(
+        "SELECT case_id, issue_type, api_supported FROM cases"
+    ).fetchall()
+    lists = [
+        (
+            row["case_id"],
+            {field: deserialize_list(row[field]) for field in CASE_LIST_FIELDS},
+        )
+        for row in rows
+    ]
+    _write_case_lists(conn, lists)
+    conn.executemany(
+        "UPDATE cases SET issue_type = ?, api_supported = ? WHERE case_id = ?",
+        [
+            (
+                ", ".join(values["issue_type"]),
+                ", ".join(values["api_supported"]),
+                case_id,
+            )
+            for case_id, values in lists
+        ],
+    )
+
+
+def _write_case_lists(
+    conn: sqlite3.Connection,
+    lists: List[Tuple[str, Dict[str, List[str]]]],
+    replace: bool = False,
+) -> None:
+    """Store ``(case_id, {field: values})`` pairs in the junction tables.
+
+    Values missing from the option tables are added to them first. With
+    ``replace=True`` the cases' existing rows are removed beforehand.
+    """
+    for field, (table, option_table) in CASE_LIST_FIELDS.items():
+        if replace:
+            conn.executemany(
+                f"DELETE FROM {table} WHERE case_id = ?",
+                [(case_id,) for case_id, _ in lists],
+            )
+        rows = [
+            (case_id, name, position)
+            for case_id, values in lists
+            for position, name in enumerate(_unique_names(values.get(field)))
+        ]
+        conn.executemany(
+            f"INSERT OR IGNORE INTO {option_table}(name) VALUES (?)",
+            {(name,) for _, name, _ in rows},
+        )
+        conn.executemany(
+            f"INSERT INTO {table}(case_id, name, position) VALUES (?, ?, ?)", rows
+        )
+
+
+def _unique_names(values: Optional[List[str]]) -> List[str]:
+    return list(dict.fromkeys(value for value in values or [] if value))
+
+
+# Tables moved by ``archive_closed_cases`` -> their key columns.
+_ARCHIVE_TABLES = {
+    "cases": ("case_id",),
+    "updates": ("id",),
+    "case_issue_types": ("case_id", "name"),
+    "case_api_supported": ("case_id", "name"),
+}
+
+
+def _create_archive_tables(conn: sqlite3.Connection) -> None:
+    """Mirror the case tables in the attached archive database.
+
+    Archive tables copy the live columns (including ones added later) but
+    carry no triggers or foreign keys; archived rows are read-only.
+    """
+    for table, key in _ARCHIVE_TABLES.items():
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS archive.{table} AS "
+            f"SELECT * FROM main.{table} WHERE 0"
+        )
+        archived = set(_table_columns(conn, "archive", table))
+        for row in conn.execute(f"PRAGMA main.table_info({table})").fetchall():
+            if row["name"] not in archived:
+                conn.execute(
+                    f"ALTER TABLE archive.{table} ADD COLUMN {row['name']} {row['type']}"
+                )
+        conn.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS archive.idx_archive_{table}_key "
+            f"ON {table}({', '.join(key)})"
+        )
+    _execute_script(
+        conn,
+        """
+        CREATE INDEX IF NOT EXISTS archive.idx_archive_cases_case_id_nocase
+            ON cases(case_id COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS archive.idx_archive_updates_case_ts
+            ON updates(case_id, ts_epoch DESC, id DESC);
+        """,
+    )
+
+
+def _table_columns(conn: sqlite3.Connection, schema: str, table: str) -> List[str]:
+    return [
+        row["name"] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")
+    ]
+
+
+def _create_status_counts(conn: sqlite3.Connection) -> None:
+    """Create ``case_status_counts``, the per-status case tally.
+
+    Triggers on ``cases`` keep it exact, so the header metrics read one row
+    per status instead of counting the whole table.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'case_status_counts'"
+    ).fetchone()
+    _execute_script(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS case_status_counts (
+            case_status TEXT PRIMARY KEY,
+            cnt INTEGER NOT NULL
+        );
+
+        CREATE TRIGGER IF NOT EXISTS case_status_counts_insert
+        AFTER INSERT ON cases BEGIN
+            INSERT INTO case_status_counts(case_status, cnt)
+            VALUES (new.case_status, 1)
+            ON CONFLICT(case_status) DO UPDATE SET cnt = cnt + 1;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS case_status_counts_delete
+        AFTER DELETE ON cases BEGIN
+            UPDATE case_status_counts SET cnt = cnt - 1
+            WHERE case_status = old.case_status;
+            DELETE FROM case_status_counts
+            WHERE case_status = old.case_status AND cnt <= 0;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS case_status_counts_update
+        AFTER UPDATE OF case_status ON cases
+        WHEN old.case_status IS NOT new.case_status BEGIN
+            UPDATE case_status_counts SET cnt = cnt - 1
+            WHERE case_status = old.case_status;
+            DELETE FROM case_status_counts
+            WHERE case_status = old.case_status AND cnt <= 0;
+            INSERT INTO case_status_counts(case_status, cnt)
+            VALUES (new.case_status, 1)
+            ON CONFLICT(case_status) DO UPDATE SET cnt = cnt + 1;
+        END;
+        """,
+    )
+    if not exists:
+        _rebuild_status_counts(conn)
+
+
+_NOW_SQL = "strftime('%Y-%m-%dT%H:%M:%fZ', 'now')"
+
+# Tables carrying row_version / updated_at -> entity name in the change feed.
+_VERSIONED_TABLES = {"cases": "case", "updates": "update"}
+
+
+def _create_change_feed(conn: sqlite3.Connection) -> None:
+    """Version every case and update write for ``changes_since``.
+
+    ``change_seq`` holds the last issued version. Triggers bump it on each
+    insert, update and delete of ``cases`` / ``updates``, stamping the row's
+    ``row_version`` and ``updated_at`` or, for deletes, recording a row in
+    ``tombstones``. All writes go through the single writer thread, so
+    versions become visible in order.
+    """
+    _execute_script(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS change_seq (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO change_seq(id, version) VALUES (1, 0);
+
+        CREATE TABLE IF NOT EXISTS tombstones (
+            version INTEGER PRIMARY KEY,
+            entity TEXT NOT NULL,
+            case_id TEXT NOT NULL,
+            update_id INTEGER,
+            deleted_at TEXT NOT NULL
+        );
+        """,
+    )
+    for table, entity in _VERSIONED_TABLES.items():
+        key_sql = "NULL" if table == "cases" else "old.id"
+        _ensure_column(conn, table, "row_version", "INTEGER")
+        _ensure_column(conn, table, "updated_at", "TEXT")
+        # Existing rows get fresh versions in rowid order.
+        conn.execute(
+            f"""
+            UPDATE {table}
+            SET row_version = (SELECT version FROM change_seq) + rowid,
+                updated_at = {_NOW_SQL}
+            WHERE row_version IS NULL
+            """
+        )
+        conn.execute(
+            f"""
+            UPDATE change_seq SET version = MAX(
+                version, (SELECT COALESCE(MAX(row_version), 0) FROM {table})
+            )
+            """
+        )
+        _execute_script(
+            conn,
+            f"""
+            CREATE INDEX IF NOT EXISTS idx_{table}_row_version
+                ON {table}(row_version);
+
+            CREATE TRIGGER IF NOT EXISTS {table}_version_insert
+            AFTER INSERT ON {table} BEGIN
+                UPDATE change_seq SET version = version + 1;
+                UPDATE {table}
+                SET row_version = (SELECT version FROM change_seq),
+                    updated_at = {_NOW_SQL}
+                WHERE rowid = new.rowid;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS {table}_version_update
+            AFTER UPDATE ON {table}
+            WHEN new.row_version IS old.row_version BEGIN
+                UPDATE change_seq SET version = version + 1;
+                UPDATE {table}
+                SET row_version = (SELECT version FROM change_seq),
+                    updated_at = {_NOW_SQL}
+                WHERE rowid = new.rowid;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS {table}_version_delete
+            AFTER DELETE ON {table} BEGIN
+                UPDATE change_seq SET version = version + 1;
+                INSERT INTO tombstones(version, entity, case_id, update_id, deleted_at)
+                SELECT version, '{entity}', old.case_id, {key_sql}, {_NOW_SQL}
+                FROM change_seq;
+            END;
+            """,
+        )
+
+
+def _rebuild_status_counts(conn: sqlite3.Connection) -> None:
+    conn.execute("DELETE FROM case_status_counts")
+    conn.execute(
+        """
+        INSERT INTO case_status_counts(case_status, cnt)
+        SELECT case_status, COUNT(*) FROM cases GROUP BY case_status
+        """
+    )
+
+
+def rebuild_summary_counts() -> None:
+    run_write(_rebuild_status_counts)
+
+
+def verify_summary_counts(repair: bool = False) -> Dict[str, Tuple[int, int]]:
+    """Compare ``case_status_counts`` with a full count of ``cases``.
+
+    Returns ``{status: (stored, actual)}`` for every status that drifted;
+    an empty dict means the counters are exact. With ``repair=True`` the
+    counters are rebuilt when drift is found.
+    """
+    def verify(conn: sqlite3.Connection) -> Dict[str, Tuple[int, int]]:
+        stored = {
+            row["case_status"]: row["cnt"]
+            for row in conn.execute("SELECT case_status, cnt FROM case_status_counts")
+        }
+        actual = {
+            row["case_status"]: row["cnt"]
+            for row in conn.execute(
+                "SELECT case_status, COUNT(*) AS cnt FROM cases GROUP BY case_status"
+            )
+        }
+        drift = {
+            status: (stored.get(status, 0), actual.get(status, 0))
+            for status in stored.keys() | actual.keys()
+            if stored.get(status, 0) != actual.get(status, 0)
+        }
+        if drift and repair:
+            _rebuild_status_counts(conn)
+        return drift
+
+    return run_write(verify)
+
+
+def _has_search_index(conn: sqlite3.Connection) -> bool:
+    key = str(DB_PATH)
+    if key not in _search_index_paths:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'cases_fts'"
+        ).fetchone()
+        _search_index_paths[key] = bool(exists)
+    return _search_index_paths[key]
+
+
+def rebuild_search_index() -> None:
+    """Rebuild ``cases_fts`` from ``cases`` (needed after a VACUUM)."""
+    def rebuild(conn: sqlite3.Connection) -> None:
+        if _has_search_index(conn):
+            conn.execute("INSERT INTO cases_fts(cases_fts) VALUES ('rebuild')")
+
+    run_write(rebuild)
+
+
+def _ensure_column(
+    conn: sqlite3.Connection, table: str, column: str, declaration: str
+) -> None:
+    columns = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+
+
+def deserialize_list(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def normalize_case_row(row: sqlite3.Row) -> Dict[str, Any]:
+    record = dict(row)
+    for field in CASE_LIST_FIELDS:
+        value = record.get(field)
+        record[field] = value.split(_LIST_SEPARATOR) if value else []
+    record["feedback_received"] = bool(record.get("feedback_received"))
+    return record
+
+
+def _case_list_sql(
+    field: str, separator: str = "char(31)", schema: str = "main"
+) -> str:
+    table, _ = CASE_LIST_FIELDS[field]
+    return (
+        f"(SELECT group_concat(name, {separator}) FROM ("
+        f"SELECT name FROM {schema}.{table} AS {table} "
+        f"WHERE {table}.case_id = cases.case_id "
+        f"ORDER BY position)) AS {field}"
+    )
+
+
+CASE_FIELDS = (
+    "case_id",
+    "seller_id",
+    "seller_name",
+    "specialist_id",
+    "specialist_name",
+    "marketplace",
+    "case_source",
+    "case_status",
+    "workstream",
+    "listing_start_date",
+    "listing_completion_date",
+    "issue_type",
+    "complexity",
+    "priority",
+    "api_supported",
+    "integration_type",
+    "seller_type",
+    "feedback_received",
+    "csat_score",
+    "notes",
+    "last_sub_status",
+)
+
+
+def _case_select_sql(schema: str, separator: str) -> str:
+    return ", ".join(
+        _case_list_sql(column, separator, schema)
+        if column in CASE_LIST_FIELDS
+        else f"cases.{column}"
+        for column in CASE_FIELDS
+    )
+
+
+# Case columns as returned to callers, per schema, with the list fields read
+# from their junction tables in stored order.
+_CASE_SELECT_SQL = {
+    schema: _case_select_sql(schema, "char(31)") for schema in ("main", "archive")
+}
+
+# Same columns with the list fields already joined for display, as used by
+# the DataFrame readers.
+_CASE_FRAME_SELECT_SQL = {
+    schema: _case_select_sql(schema, "', '") for schema in ("main", "archive")
+}
+
+
+def _schemas(include_archived: bool) -> Tuple[str, ...]:
+    return ("main", "archive") if include_archived else ("main",)
+
+
+def _where_sql(clauses: List[str]) -> str:
+    return " WHERE " + " AND ".join(clauses) if clauses else ""
+
+
+def _frame_from_cursor(
+    cursor: sqlite3.Cursor, categories: Tuple[str, ...] = ()
+) -> pd.DataFrame:
+    """Build a DataFrame column by column from a tuple-row cursor."""
+    names = [description[0] for description in cursor.description]
+    rows = cursor.fetchall()
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    return pd.DataFrame(
+        {
+            name: pd.Categorical(values)
+            if name in categories
+            else pd.Series(values, dtype=object if not values else None)
+            for name, values in zip(names, columns)
+        }
+    )
+
+
+def _tuple_cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor
+
+
+def _case_frame(cursor: sqlite3.Cursor) -> pd.DataFrame:
+    frame = _frame_from_cursor(cursor, CASE_CATEGORY_COLUMNS)
+    frame["feedback_received"] = frame["feedback_received"].astype(bool)
+    for field in CASE_LIST_FIELDS:
+        frame[field] = frame[field].fillna("")
+    return frame
+
+
+def _case_filter_sql(
+    conn: sqlite3.Connection, filters: Dict[str, Any], schema: str = "main"
+) -> Tuple[List[str], Dict[str, Any]]:
+    """Build WHERE clauses for the case filters.
+
+    Text columns take case-insensitive "contains" filters. Terms of three or
+    more characters are first narrowed through the trigram index; the LIKE
+    check is kept so results match the plain scan exactly (shorter terms and
+    terms with LIKE wildcards only use LIKE).
+
+    ``<list field>_any`` / ``<list field>_all`` (e.g. ``issue_type_any``)
+    take a list of exact names and match cases having any / all of them.
+
+    The archive has no trigram index, so its clauses are LIKE only; they also
+    skip cases still present in ``main`` (mid-move, see
+    ``archive_closed_cases``).
+    """
+    clauses: List[str] = []
+    params: Dict[str, Any] = {}
+    match_terms: List[str] = []
+    use_index = schema == "main" and _has_search_index(conn)
+    if schema != "main":
+        clauses.append("cases.case_id NOT IN (SELECT case_id FROM main.cases)")
+
+    for field, (table, _) in CASE_LIST_FIELDS.items():
+        for mode in ("any", "all"):
+            names = _unique_names(filters.get(f"{field}_{mode}"))
+            if not names:
+                continue
+            keys = [f"{field}_{mode}_{index}" for index in range(len(names))]
+            params.update(zip(keys, names))
+            subquery = (
+                f"SELECT case_id FROM {schema}.{table} "
+                f"WHERE name IN ({', '.join(':' + key for key in keys)})"
+            )
+            if mode == "all":
+                subquery += f" GROUP BY case_id HAVING COUNT(*) = {len(names)}"
+            clauses.append(f"cases.case_id IN ({subquery})")
+
+    for key, value in filters.items():
+        if not value or key not in CASE_TEXT_COLUMNS:
+            continue
+        clauses.append(f"LOWER(cases.{key}) LIKE :{key}")
+        params[key] = f"%{value.lower()}%"
+        if use_index and len(value) >= 3 and not set(value) & {"%", "_"}:
+            phrase = value.replace('"', '""')
+            match_terms.append(f'{key} : "{phrase}"')
+
+    if match_terms:
+        clauses.insert(
+            0,
+            "cases.rowid IN "
+            "(SELECT rowid FROM cases_fts WHERE cases_fts MATCH :fts_match)",
+        )
+        params["fts_match"] = " AND ".join(match_terms)
+    return clauses, params
+
+
+def _case_sources(
+    conn: sqlite3.Connection, filters: Dict[str, Any], include_archived: bool
+) -> Tuple[List[Tuple[str, List[str]]], Dict[str, Any]]:
+    """(schema, WHERE clauses) for the live cases and optionally the archive."""
+    sources = []
+    params: Dict[str, Any] = {}
+    for schema in _schemas(include_archived):
+        clauses, schema_params = _case_filter_sql(conn, filters, schema)
+        sources.append((schema, clauses))
+        params.update(schema_params)
+    return sources, params
+
+
+def _cases_query(
+    conn: sqlite3.Connection,
+    filters: Dict[str, Any],
+    include_archived: bool,
+    select_sql: Dict[str, str],
+) -> Tuple[str, Dict[str, Any]]:
+    sources, params = _case_sources(conn, filters, include_archived)
+    query = " UNION ALL ".join(
+        f"SELECT {select_sql[schema]} FROM {schema}.cases AS cases"
+        + _where_sql(clauses)
+        for schema, clauses in sources
+    )
+    return query + " ORDER BY case_id COLLATE NOCASE", params
+
+
+@_cached_read
+def list_cases(
+    filters: Optional[Dict[str, Any]] = None, include_archived: bool = False
+) -> List[Dict[str, Any]]:
+    with get_connection() as conn:
+        query, params = _cases_query(
+            conn, filters or {}, include_archived, _CASE_SELECT_SQL
+        )
+        rows = conn.execute(query, params).fetchall()
+
+    return [normalize_case_row(row) for row in rows]
+
+
+_CASE_IDS_SQL = "SELECT case_id FROM cases ORDER BY case_id COLLATE NOCASE"
+
+
+@_cached_read
+def list_case_ids() -> List[str]:
+    """Live case IDs in ``list_cases`` order, for case pickers."""
+    with get_connection() as conn:
+        rows = conn.execute(_CASE_IDS_SQL).fetchall()
+    return [row["case_id"] for row in rows]
+
+
+def iter_case_rows(
+    filters: Optional[Dict[str, Any]] = None,
+    include_archived: bool = False,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> Iterator[Tuple[Any, ...]]:
+    """Yield cases as plain tuples in ``CASE_FIELDS`` order.
+
+    Rows are fetched ``chunk_size`` at a time from one read snapshot, so
+    memory stays flat however many cases match. List fields come back
+    ", "-joined.
+    """
+    with get_connection() as conn:
+        query, params = _cases_query(
+            conn, filters or {}, include_archived, _CASE_FRAME_SELECT_SQL
+        )
+        yield from _iter_rows(_tuple_cursor(conn).execute(query, params), chunk_size)
+
+
+def _iter_rows(cursor: sqlite3.Cursor, chunk_size: int) -> Iterator[Any]:
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield from rows
+
+
+class Page(NamedTuple):
+    rows: Union[List[Dict[str, Any]], pd.DataFrame]
+    next_cursor: Optional[Tuple[Any, Any]]
+    total: Optional[int]
+
+
+def _keyset_clause(
+    sort_sql: str,
+    key_sql: str,
+    descending: bool,
+    cursor: Tuple[Any, Any],
+    params: Dict[str, Any],
+) -> str:
+    """WHERE clause selecting rows after ``cursor`` in (sort, key) order.
+
+    Written as a range on the sort column so SQLite can seek into the
+    matching (sort, key) index instead of scanning it.
+    """
+    params["cursor_sort"], params["cursor_key"] = cursor
+    op = "<" if descending else ">"
+    return (
+        f"({sort_sql} {op}= :cursor_sort AND "
+        f"({sort_sql} {op} :cursor_sort OR {key_sql} {op} :cursor_key))"
+    )
+
+
+def _page_query(queries: List[str], order_sql: str) -> str:
+    """Combine per-schema page queries, each already ordered and limited."""
+    if len(queries) == 1:
+        return queries[0]
+    return (
+        " UNION ALL ".join(f"SELECT * FROM ({query})" for query in queries)
+        + f" ORDER BY {order_sql} LIMIT :page_limit"
+    )
+
+
+def _cases_page_query(
+    sources: List[Tuple[str, List[str]]],
+    params: Dict[str, Any],
+    select_sql: Dict[str, str],
+    sort_by: str,
+    descending: bool,
+    cursor: Optional[Tuple[Any, Any]],
+) -> str:
+    """The ``list_cases_page`` query; adds the cursor to ``params``."""
+    sort_sql = f"cases.{sort_by} COLLATE NOCASE"
+    direction = "DESC" if descending else "ASC"
+    if cursor is not None:
+        keyset = _keyset_clause(sort_sql, "cases.case_id", descending, cursor, params)
+        sources = [(schema, clauses + [keyset]) for schema, clauses in sources]
+    return _page_query(
+        [
+            f"SELECT {select_sql[schema]}, {sort_sql} AS _sort_key "
+            f"FROM {schema}.cases AS cases"
+            + _where_sql(clauses)
+            + f" ORDER BY {sort_sql} {direction}, cases.case_id {direction}"
+            " LIMIT :page_limit"
+            for schema, clauses in sources
+        ],
+        f"_sort_key COLLATE NOCASE {direction}, case_id {direction}",
+    )
+
+
+@_cached_read
+def list_cases_page(
+    filters: Optional[Dict[str, Any]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    sort_by: str = "case_id",
+    descending: bool = False,
+    cursor: Optional[Tuple[Any, Any]] = None,
+    with_total: bool = False,
+    as_frame: bool = False,
+    include_archived: bool = False,
+) -> Page:
+    """Return one page of cases ordered by ``sort_by`` then ``case_id``.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to get the following
+    page; it is ``None`` on the last page. With ``as_frame=True`` the rows
+    come back as a DataFrame built straight from the cursor, with issue
+    types and supported APIs ", "-joined and the low-cardinality columns as
+    categoricals.
+    """
+    if sort_by not in CASE_SORT_COLUMNS:
+        raise ValueError(f"Cannot sort cases by {sort_by}")
+    select_sql = _CASE_FRAME_SELECT_SQL if as_frame else _CASE_SELECT_SQL
+
+    with get_connection() as conn:
+        sources, params = _case_sources(conn, filters or {}, include_archived)
+        total = None
+        if with_total:
+            total = sum(
+                conn.execute(
+                    f"SELECT COUNT(*) FROM {schema}.cases AS cases"
+                    + _where_sql(clauses),
+                    params,
+                ).fetchone()[0]
+                for schema, clauses in sources
+            )
+
+        query = _cases_page_query(
+            sources, params, select_sql, sort_by, descending, cursor
+        )
+        params["page_limit"] = page_size + 1
+        if as_frame:
+            frame = _case_frame(_tuple_cursor(conn).execute(query, params))
+        else:
+            rows = conn.execute(query, params).fetchall()
+
+    if as_frame:
+        return _frame_page(frame, page_size, "case_id", total)
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = (rows[-1]["_sort_key"], rows[-1]["case_id"])
+
+    records = []
+    for row in rows:
+        record = normalize_case_row(row)
+        record.pop("_sort_key")
+        records.append(record)
+    return Page(records, next_cursor, total)
+
+
+def _frame_page(
+    frame: pd.DataFrame, page_size: int, key: str, total: Optional[int]
+) -> Page:
+    next_cursor = None
+    if len(frame) > page_size:
+        frame = frame.iloc[:page_size]
+        last = frame.iloc[-1]
+        # Cursor values go back into SQL, so unwrap numpy scalars.
+        next_cursor = tuple(
+            value.item() if hasattr(value, "item") else value
+            for value in (last["_sort_key"], last[key])
+        )
+    return Page(frame.drop(columns="_sort_key"), next_cursor, total)
+
+
+def _concat_pages(
+    read_page: Callable[[Optional[Tuple[Any, Any]]], Page],
+    categories: Tuple[str, ...],
+) -> pd.DataFrame:
+    """Concatenate the frame pages returned by ``read_page(cursor)``.
+
+    Pages carry their own categories, so the categorical columns are
+    rebuilt over the combined values.
+    """
+    frames = []
+    cursor = None
+    while True:
+        page = read_page(cursor)
+        frames.append(page.rows)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    frame = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    for column in categories:
+        if frame[column].dtype != "category":
+            frame[column] = frame[column].astype("category")
+    return frame
+
+
+def list_cases_frame(
+    filters: Optional[Dict[str, Any]] = None, include_archived: bool = False
+) -> pd.DataFrame:
+    """Like ``list_cases`` but as one DataFrame, in ``case_id`` order.
+
+    Rows are read ``FRAME_PAGE_SIZE`` at a time through
+    ``list_cases_page(as_frame=True)``, so the columns match its frames.
+    """
+    return _concat_pages(
+        lambda cursor: list_cases_page(
+            filters,
+            page_size=FRAME_PAGE_SIZE,
+            cursor=cursor,
+            as_frame=True,
+            include_archived=include_archived,
+        ),
+        CASE_CATEGORY_COLUMNS,
+    )
+
+
+@_cached_read
+def get_case(case_id: str, include_archived: bool = False) -> Optional[Dict[str, Any]]:
+    with get_connection() as conn:
+        for schema in _schemas(include_archived):
+            row = conn.execute(
+                f"SELECT {_CASE_SELECT_SQL[schema]} FROM {schema}.cases AS cases "
+                "WHERE case_id = ?",
+                (case_id,),
+            ).fetchone()
+            if row:
+                return normalize_case_row(row)
+    return None
+
+
+_INSERT_CASE_SQL = """
+    INSERT INTO cases (
+        case_id, seller_id, seller_name, specialist_id, specialist_name,
+        marketplace, case_source, case_status, workstream,
+        listing_start_date, listing_completion_date, issue_type, complexity,
+        priority, api_supported, integration_type, seller_type,
+        feedback_received, csat_score, notes, last_sub_status
+    )
+    VALUES (
+        :case_id, :seller_id, :seller_name, :specialist_id, :specialist_name,
+        :marketplace, :case_source, :case_status, :workstream,
+        :listing_start_date, :listing_completion_date, :issue_type, :complexity,
+        :priority, :api_supported, :integration_type, :seller_type,
+        :feedback_received, :csat_score, :notes, :last_sub_status
+    )
+"""
+
+_UPDATE_CASE_SQL = """
+    UPDATE cases
+    SET
+        seller_id = :seller_id,
+        seller_name = :seller_name,
+        specialist_id = :specialist_id,
+        specialist_name = :specialist_name,
+        marketplace = :marketplace,
+        case_source = :case_source,
+        case_status = :case_status,
+        workstream = :workstream,
+        listing_start_date = :listing_start_date,
+        listing_completion_date = :listing_completion_date,
+        issue_type = :issue_type,
+        complexity = :complexity,
+        priority = :priority,
+        api_supported = :api_supported,
+        integration_type = :integration_type,
+        seller_type = :seller_type,
+        feedback_received = :feedback_received,
+        csat_score = :csat_score,
+        notes = :notes,
+        last_sub_status = :last_sub_status
+    WHERE case_id = :case_id
+"""
+
+# Sortable copy of ``timestamp`` in whole seconds, so ordering by
+# (ts_epoch, id) matches the old ``datetime(timestamp), id`` order while
+# letting SQLite walk an index instead of sorting. Unparseable timestamps get
+# the smallest integer, which sorts exactly where NULL did and keeps the
+# column usable as a keyset pagination key.
+_TS_EPOCH_SQL = "COALESCE(CAST(strftime('%s', {}) AS INTEGER), -9223372036854775808)"
+
+_UPDATE_COLUMNS_SQL = "id, case_id, note, updated_by, timestamp, sub_status"
+_UPDATES_ORDER_SQL = "ORDER BY ts_epoch DESC, id DESC"
+
+_INSERT_UPDATE_SQL = f"""
+    INSERT INTO updates (case_id, note, updated_by, timestamp, sub_status, ts_epoch)
+    VALUES (
+        :case_id, :note, :updated_by, :timestamp, :sub_status,
+        {_TS_EPOCH_SQL.format(":timestamp")}
+    )
+"""
+
+# Keeps an imported update's ID; a NULL :id gets the next one.
+_INSERT_UPDATE_WITH_ID_SQL = f"""
+    INSERT INTO updates (
+        id, case_id, note, updated_by, timestamp, sub_status, ts_epoch
+    )
+    VALUES (
+        :id, :case_id, :note, :updated_by, :timestamp, :sub_status,
+        {_TS_EPOCH_SQL.format(":timestamp")}
+    )
+"""
+
+_UPDATE_UPDATE_SQL = f"""
+    UPDATE updates
+    SET
+        case_id = :case_id,
+        note = :note,
+        updated_by = :updated_by,
+        timestamp = :timestamp,
+        sub_status = :sub_status,
+        ts_epoch = {_TS_EPOCH_SQL.format(":timestamp")}
+    WHERE id = :id
+"""
+
+
+def _case_payload(case_data: Dict[str, Any]) -> Dict[str, Any]:
+    payload = case_data.copy()
+    for field in CASE_LIST_FIELDS:
+        payload[field] = ", ".join(_unique_names(case_data.get(field)))
+    payload["feedback_received"] = 1 if case_data.get("feedback_received") else 0
+    return payload
+
+
+def _case_lists(case_data: Dict[str, Any]) -> Tuple[str, Dict[str, List[str]]]:
+    return (
+        case_data["case_id"],
+        {field: case_data.get(field) or [] for field in CASE_LIST_FIELDS},
+    )
+
+
+def create_case(case_data: Dict[str, Any]) -> None:
+    def write(conn: sqlite3.Connection) -> None:
+        if _archived_case_ids(conn, [case_data["case_id"]]):
+            # Archiving the new case would collide with the archived one.
+            raise ValueError(
+                f"Case {case_data['case_id']} already exists in the archive."
+            )
+        conn.execute(_INSERT_CASE_SQL, _case_payload(case_data))
+        _write_case_lists(conn, [_case_lists(case_data)])
+
+    run_write(write)
+
+
+def update_case(case_id: str, case_data: Dict[str, Any]) -> None:
+    payload = _case_payload(case_data)
+    payload["case_id"] = case_id
+
+    def write(conn: sqlite3.Connection) -> None:
+        conn.execute(_UPDATE_CASE_SQL, payload)
+        _write_case_lists(
+            conn, [_case_lists({**case_data, "case_id": case_id})], replace=True
+        )
+
+    run_write(write)
+
+
+def delete_case(case_id: str) -> None:
+    _write_statement("DELETE FROM cases WHERE case_id = ?", (case_id,))
+
+
+def _update_sources(
+    case_id: Optional[str], include_archived: bool
+) -> Tuple[List[Tuple[str, List[str]]], Dict[str, Any]]:
+    """(schema, WHERE clauses) for the live updates and optionally the archive."""
+    sources = []
+    for schema in _schemas(include_archived):
+        clauses = ["case_id = :case_id"] if case_id else []
+        if schema != "main":
+            clauses.append("id NOT IN (SELECT id FROM main.updates)")
+        sources.append((schema, clauses))
+    return sources, {"case_id": case_id} if case_id else {}
+
+
+def _updates_query(
+    case_id: Optional[str], include_archived: bool
+) -> Tuple[str, Dict[str, Any]]:
+    sources, params = _update_sources(case_id, include_archived)
+    if len(sources) == 1:
+        query = (
+            f"SELECT {_UPDATE_COLUMNS_SQL} FROM updates"
+            + _where_sql(sources[0][1])
+            + f" {_UPDATES_ORDER_SQL}"
+        )
+        return query, params
+    union = " UNION ALL ".join(
+        f"SELECT {_UPDATE_COLUMNS_SQL}, ts_epoch FROM {schema}.updates"
+        + _where_sql(clauses)
+        for schema, clauses in sources
+    )
+    return f"SELECT {_UPDATE_COLUMNS_SQL} FROM ({union}) {_UPDATES_ORDER_SQL}", params
+
+
+@_cached_read
+def list_updates(
+    case_id: Optional[str] = None, include_archived: bool = False
+) -> List[Dict[str, Any]]:
+    query, params = _updates_query(case_id, include_archived)
+    with get_connection() as conn:
+        rows = conn.execute(query, params).fetchall()
+
+    return [dict(row) for row in rows]
+
+
+def iter_update_rows(
+    case_id: Optional[str] = None,
+    include_archived: bool = False,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> Iterator[Tuple[Any, ...]]:
+    """Yield updates as plain tuples in ``list_updates`` column order.
+
+    Like ``iter_case_rows``, rows are fetched ``chunk_size`` at a time.
+    """
+    query, params = _updates_query(case_id, include_archived)
     with get_connection() as conn:
-        conn.executescript(
-            """
-            PRAGMA journal_mode=WAL;
-            PRAGMA foreign_keys=ON;
-
-            CREATE TABLE IF NOT EXISTS cases (
-                case_id TEXT PRIMARY KEY,
-                seller_id INTEGER NOT NULL,
-                seller_name TEXT NOT NULL,
-                specialist_id TEXT NOT NULL,
-                specialist_name TEXT NOT NULL,
-                marketplace TEXT NOT NULL,
-                case_source TEXT NOT NULL,
-                case_status TEXT NOT NULL,
-                workstream TEXT NOT NULL,
-                listing_start_date TEXT,
-                listing_completion_date TEXT,
-                issue_type TEXT NOT NULL,
-                complexity TEXT NOT NULL,
-                priority TEXT NOT NULL,
-                api_supported TEXT NOT NULL,
-                integration_type TEXT NOT NULL,
-                seller_type TEXT NOT NULL,
-                feedback_received INTEGER NOT NULL,
-                csat_score REAL,
-                notes TEXT,
-                last_sub_status TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS updates (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                case_id TEXT NOT NULL,
-                note TEXT NOT NULL,
-                updated_by TEXT NOT NULL,
-                timestamp TEXT NOT NULL,
-                sub_status TEXT NOT NULL,
-                FOREIGN KEY (case_id) REFERENCES cases(case_id) ON DELETE CASCADE
-            );
-
-            CREATE TABLE IF NOT EXISTS api_options (
-                name TEXT PRIMARY KEY
-            );
-
-            CREATE TABLE IF NOT EXISTS issue_options (
-                name TEXT PRIMARY KEY
-            );
-            """
-        )
+        yield from _iter_rows(_tuple_cursor(conn).execute(query, params), chunk_size)
 
-    seed_option_table("api_options", DEFAULT_API_OPTIONS)
-    seed_option_table("issue_options", DEFAULT_ISSUE_OPTIONS)
 
+def _updates_page_query(
+    sources: List[Tuple[str, List[str]]],
+    params: Dict[str, Any],
+    sort_by: str,
+    descending: bool,
+    cursor: Optional[Tuple[Any, Any]],
+) -> str:
+    """The ``list_updates_page`` query; adds the cursor to ``params``."""
+    sort_sql = UPDATE_SORT_COLUMNS[sort_by]
+    direction = "DESC" if descending else "ASC"
+    if cursor is not None:
+        keyset = _keyset_clause(sort_sql, "id", descending, cursor, params)
+        sources = [(schema, clauses + [keyset]) for schema, clauses in sources]
+    return _page_query(
+        [
+            f"SELECT {_UPDATE_COLUMNS_SQL}, {sort_sql} AS _sort_key "
+            f"FROM {schema}.updates"
+            + _where_sql(clauses)
+            + f" ORDER BY {sort_sql} {direction}, id {direction} LIMIT :page_limit"
+            for schema, clauses in sources
+        ],
+        f"_sort_key {direction}, id {direction}",
+    )
 
-def seed_option_table(table: str, values: List[str]) -> None:
-    with get_connection() as conn:
-        conn.executemany(
-            f"INSERT OR IGNORE INTO {table}(name) VALUES (?)",
-            [(value,) for value in values],
-        )
 
+@_cached_read
+def list_updates_page(
+    case_id: Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    sort_by: str = "timestamp",
+    descending: bool = True,
+    cursor: Optional[Tuple[Any, Any]] = None,
+    with_total: bool = False,
+    as_frame: bool = False,
+    include_archived: bool = False,
+) -> Page:
+    """Return one page of updates ordered by ``sort_by`` then ``id``.
 
-def serialize_list(value: List[str]) -> str:
-    return json.dumps(value)
+    With ``as_frame=True`` the rows come back as a DataFrame built straight
+    from the cursor.
+    """
+    if sort_by not in UPDATE_SORT_COLUMNS:
+        raise ValueError(f"Cannot sort updates by {sort_by}")
+    sources, params = _update_sources(case_id, include_archived)
 
+    with get_connection() as conn:
+        total = None
+        if with_total:
+            total = sum(
+                conn.execute(
+                    f"SELECT COUNT(*) FROM {schema}.updates" + _where_sql(clauses),
+                    params,
+                ).fetchone()[0]
+                for schema, clauses in sources
+            )
 
-def deserialize_list(value: Optional[str]) -> List[str]:
-    if not value:
-        return []
-    try:
-        return json.loads(value)
-    except json.JSONDecodeError:
-        return [item.strip() for item in value.split(",") if item.strip()]
+        query = _updates_page_query(sources, params, sort_by, descending, cursor)
+        params["page_limit"] = page_size + 1
+        if as_frame:
+            frame = _frame_from_cursor(
+                _tuple_cursor(conn).execute(query, params), UPDATE_CATEGORY_COLUMNS
+            )
+        else:
+            rows = conn.execute(query, params).fetchall()
 
+    if as_frame:
+        return _frame_page(frame, page_size, "id", total)
 
-def normalize_case_row(row: sqlite3.Row) -> Dict[str, Any]:
-    record = dict(row)
-    record["issue_type"] = deserialize_list(record.get("issue_type"))
-    record["api_supported"] = deserialize_list(record.get("api_supported"))
-    record["feedback_received"] = bool(record.get("feedback_received"))
-    return record
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = (rows[-1]["_sort_key"], rows[-1]["id"])
 
+    records = []
+    for row in rows:
+        record = dict(row)
+        record.pop("_sort_key")
+        records.append(record)
+    return Page(records, next_cursor, total)
 
-def list_cases(filters: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
-    filters = filters or {}
-    clauses: List[str] = []
-    params: Dict[str, Any] = {}
 
-    text_columns = {
-        "case_id",
-        "case_status",
-        "last_sub_status",
-        "seller_name",
-        "specialist_name",
-        "marketplace",
-        "workstream",
-        "priority",
-        "issue_type",
-    }
+def list_updates_frame(
+    case_id: Optional[str] = None, include_archived: bool = False
+) -> pd.DataFrame:
+    """Like ``list_updates`` but as one DataFrame, newest first.
 
-    for key, value in filters.items():
-        if not value or key not in text_columns:
-            continue
-        clauses.append(f"LOWER({key}) LIKE :{key}")
-        params[key] = f"%{value.lower()}%"
+    Rows are read ``FRAME_PAGE_SIZE`` at a time through
+    ``list_updates_page(as_frame=True)``, so the columns match its frames.
+    """
+    return _concat_pages(
+        lambda cursor: list_updates_page(
+            case_id,
+            page_size=FRAME_PAGE_SIZE,
+            cursor=cursor,
+            as_frame=True,
+            include_archived=include_archived,
+        ),
+        UPDATE_CATEGORY_COLUMNS,
+    )
 
-    query = "SELECT * FROM cases"
-    if clauses:
-        query += " WHERE " + " AND ".join(clauses)
-    query += " ORDER BY case_id COLLATE NOCASE"
 
+@_cached_read
+def get_update(update_id: int) -> Optional[Dict[str, Any]]:
     with get_connection() as conn:
-        rows = conn.execute(query, params).fetchall()
+        row = conn.execute(
+            f"SELECT {_UPDATE_COLUMNS_SQL} FROM updates WHERE id = ?", (update_id,)
+        ).fetchone()
+    return dict(row) if row else None
 
-    return [normalize_case_row(row) for row in rows]
 
+def create_update(update_data: Dict[str, Any]) -> int:
+    def write(conn: sqlite3.Connection) -> int:
+        cursor = conn.execute(_INSERT_UPDATE_SQL, update_data)
+        update_case_last_sub_status(conn, update_data["case_id"])
+        return cursor.lastrowid
+
+    return run_write(write)
 
-def get_case(case_id: str) -> Optional[Dict[str, Any]]:
-    with get_connection() as conn:
+
+def update_update(update_id: int, update_data: Dict[str, Any]) -> None:
+    def write(conn: sqlite3.Connection) -> None:
+        conn.execute(_UPDATE_UPDATE_SQL, {**update_data, "id": update_id})
+        update_case_last_sub_status(conn, update_data["case_id"])
+
+    run_write(write)
+
+
+def delete_update(update_id: int) -> None:
+    def write(conn: sqlite3.Connection) -> None:
         row = conn.execute(
-            "SELECT * FROM cases WHERE case_id = ?", (case_id,)
+            "SELECT case_id FROM updates WHERE id = ?", (update_id,)
         ).fetchone()
+        if not row:
+            return
+        case_id = row["case_id"]
+        conn.execute("DELETE FROM updates WHERE id = ?", (update_id,))
+        update_case_last_sub_status(conn, case_id)
 
-    if not row:
-        return None
-    return normalize_case_row(row)
+    run_write(write)
 
 
-def create_case(case_data: Dict[str, Any]) -> None:
-    payload = case_data.copy()
-    payload["issue_type"] = serialize_list(case_data.get("issue_type", []))
-    payload["api_supported"] = serialize_list(case_data.get("api_supported", []))
-    payload["feedback_received"] = 1 if case_data.get("feedback_received") else 0
+def update_case_last_sub_status(conn: sqlite3.Connection, case_id: str) -> None:
+    refresh_last_sub_status(conn, [case_id])
+
+
+_LATEST_SUB_STATUS_SQL = f"""(
+    SELECT sub_status
+    FROM updates
+    WHERE updates.case_id = cases.case_id
+    {_UPDATES_ORDER_SQL}
+    LIMIT 1
+)"""
+
+
+def refresh_last_sub_status(
+    conn: sqlite3.Connection, case_ids: List[str], with_updates_only: bool = False
+) -> None:
+    # ``with_updates_only`` leaves cases that have no updates with the value
+    # they were given.
+    for chunk in _chunked(list(dict.fromkeys(case_ids)), SQL_PARAM_CHUNK):
+        conn.execute(_refresh_sub_status_sql(len(chunk), with_updates_only), chunk)
+
+
+def _refresh_sub_status_sql(count: int, with_updates_only: bool) -> str:
+    # Only cases whose value actually changes are written, so unchanged rows
+    # keep their row_version.
+    has_updates = (
+        "AND EXISTS (SELECT 1 FROM updates WHERE updates.case_id = cases.case_id)"
+        if with_updates_only
+        else ""
+    )
+    return f"""
+        UPDATE cases
+        SET last_sub_status = {_LATEST_SUB_STATUS_SQL}
+        WHERE case_id IN ({", ".join("?" * count)})
+            AND last_sub_status IS NOT {_LATEST_SUB_STATUS_SQL}
+            {has_updates}
+    """
 
+
+def _chunked(values: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(values)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _existing_case_ids(conn: sqlite3.Connection, case_ids: List[str]) -> Set[str]:
+    existing: Set[str] = set()
+    for chunk in _chunked(list(dict.fromkeys(case_ids)), SQL_PARAM_CHUNK):
+        placeholders = ", ".join("?" for _ in chunk)
+        rows = conn.execute(
+            f"SELECT case_id FROM cases WHERE case_id IN ({placeholders})", chunk
+        ).fetchall()
+        existing.update(row["case_id"] for row in rows)
+    return existing
+
+
+def find_case_ids(case_ids: Iterable[str]) -> Dict[str, str]:
+    """Map each of ``case_ids`` that exists to the schema holding it
+    ("main" or "archive"); unknown IDs are left out."""
+    case_ids = list(dict.fromkeys(case_ids))
     with get_connection() as conn:
-        conn.execute(
-            """
-            INSERT INTO cases (
-                case_id, seller_id, seller_name, specialist_id, specialist_name,
-                marketplace, case_source, case_status, workstream,
-                listing_start_date, listing_completion_date, issue_type, complexity,
-                priority, api_supported, integration_type, seller_type,
-                feedback_received, csat_score, notes, last_sub_status
-            )
-            VALUES (
-                :case_id, :seller_id, :seller_name, :specialist_id, :specialist_name,
-                :marketplace, :case_source, :case_status, :workstream,
-                :listing_start_date, :listing_completion_date, :issue_type, :complexity,
-                :priority, :api_supported, :integration_type, :seller_type,
-                :feedback_received, :csat_score, :notes, :last_sub_status
-            )
-            """,
-            payload,
+        found = dict.fromkeys(_archived_case_ids(conn, case_ids), "archive")
+        found.update(dict.fromkeys(_existing_case_ids(conn, case_ids), "main"))
+    return found
+
+
+def _insert_updates(
+    conn: sqlite3.Connection,
+    updates: List[Dict[str, Any]],
+    insert_sql: str = _INSERT_UPDATE_SQL,
+) -> int:
+    """Insert a chunk of updates, falling back to row-by-row on conflicts.
+
+    Returns how many rows were written; rows that violate a constraint are
+    left out, matching the per-row import behaviour.
+    """
+    if not updates:
+        return 0
+    conn.execute("SAVEPOINT import_updates")
+    try:
+        conn.executemany(insert_sql, updates)
+        conn.execute("RELEASE import_updates")
+        return len(updates)
+    except sqlite3.IntegrityError:
+        conn.execute("ROLLBACK TO import_updates")
+        conn.execute("RELEASE import_updates")
+
+    written = 0
+    for update in updates:
+        try:
+            conn.execute(insert_sql, update)
+            written += 1
+        except sqlite3.IntegrityError:
+            continue
+    return written
+
+
+def bulk_import(
+    cases: Iterable[Dict[str, Any]],
+    updates: Iterable[Dict[str, Any]],
+    mode: str = "skip",
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> Dict[str, int]:
+    """Import parsed workbook rows with set-based checks and batched writes.
+
+    Each chunk of ``chunk_size`` rows is one request to the writer thread,
+    applied atomically, and ``last_sub_status`` is recomputed once, at the
+    end, for every case that received updates or was merged. In ``skip`` mode cases that
+    already exist, live or archived, are left untouched, and updates are only
+    written for live cases. In ``merge`` mode existing cases, and updates matched on
+    their ``id``, are compared by content hash and only rows that differ are
+    rewritten; see ``bulk_import_chunks`` for the counts returned.
+    """
+    return bulk_import_chunks(
+        _chunked(cases, chunk_size), _chunked(updates, chunk_size), mode
+    )
+
+
+def bulk_import_chunks(
+    case_chunks: Iterable[List[Dict[str, Any]]],
+    update_chunks: Iterable[List[Dict[str, Any]]],
+    mode: str = "skip",
+) -> Dict[str, int]:
+    """Like ``bulk_import`` for records that arrive already chunked.
+
+    Chunks are consumed lazily, all cases before any updates, so a streaming
+    parser such as ``excel_utils.iter_case_records`` can feed it without the
+    whole workbook in memory. Each chunk is one write request.
+
+    Returns created/updated/unchanged/skipped counts for cases and updates
+    (``updated_*`` and ``unchanged_*`` stay 0 in ``skip`` mode). A repeated
+    case ID within the import is skipped after its first row, as is a
+    merged update whose ID belongs to an archived update.
+    """
+    if mode not in IMPORT_MODES:
+        raise ValueError(f"Unknown import mode: {mode}")
+
+    counts = {
+        f"{outcome}_{entity}": 0
+        for entity in ("cases", "updates")
+        for outcome in ("created", "updated", "unchanged", "skipped")
+    }
+    seen: Set[str] = set()
+    touched: List[str] = []
+    # Merged cases take their workbook Last Sub-Status, which their latest
+    # update, if they have any, then overrides.
+    merged: List[str] = []
+
+    def write_cases(conn: sqlite3.Connection, chunk: List[Dict[str, Any]]) -> None:
+        case_ids = [c["case_id"] for c in chunk]
+        existing = _existing_case_ids(conn, case_ids)
+        existing |= _archived_case_ids(conn, case_ids)
+        to_create = []
+        for case in chunk:
+            if case["case_id"] in existing or case["case_id"] in seen:
+                counts["skipped_cases"] += 1
+                continue
+            seen.add(case["case_id"])
+            to_create.append(case)
+        conn.executemany(_INSERT_CASE_SQL, map(_case_payload, to_create))
+        _write_case_lists(conn, [_case_lists(case) for case in to_create])
+        counts["created_cases"] += len(to_create)
+
+    def write_updates(conn: sqlite3.Connection, chunk: List[Dict[str, Any]]) -> None:
+        existing = _existing_case_ids(
+            conn, [u["case_id"] for u in chunk if u.get("case_id")]
         )
+        to_create = [u for u in chunk if u.get("case_id") and u["case_id"] in existing]
+        written = _insert_updates(conn, to_create) if to_create else 0
+        counts["created_updates"] += written
+        counts["skipped_updates"] += len(chunk) - written
+        touched.extend(u["case_id"] for u in to_create)
 
+    def merge_cases(conn: sqlite3.Connection, chunk: List[Dict[str, Any]]) -> None:
+        fresh = []
+        for case in chunk:
+            if case["case_id"] in seen:
+                counts["skipped_cases"] += 1
+                continue
+            seen.add(case["case_id"])
+            fresh.append(case)
+        case_ids = [case["case_id"] for case in fresh]
+        stored = _stored_case_hashes(conn, case_ids)
+        archived = _archived_case_ids(conn, case_ids)
+        to_create, to_update = [], []
+        for case in fresh:
+            payload = _case_payload(case)
+            stored_hash = stored.get(case["case_id"])
+            if stored_hash is None:
+                if case["case_id"] in archived:
+                    # Archived cases are read-only; re-creating one in main
+                    # would hide the archived copy.
+                    counts["skipped_cases"] += 1
+                else:
+                    to_create.append((case, payload))
+            elif stored_hash == _case_hash(payload):
+                counts["unchanged_cases"] += 1
+            else:
+                to_update.append((case, payload))
+        conn.executemany(_INSERT_CASE_SQL, [payload for _, payload in to_create])
+        conn.executemany(_UPDATE_CASE_SQL, [payload for _, payload in to_update])
+        _write_case_lists(conn, [_case_lists(case) for case, _ in to_create])
+        _write_case_lists(
+            conn, [_case_lists(case) for case, _ in to_update], replace=True
+        )
+        counts["created_cases"] += len(to_create)
+        counts["updated_cases"] += len(to_update)
+        merged.extend(case["case_id"] for case, _ in to_update)
 
-def update_case(case_id: str, case_data: Dict[str, Any]) -> None:
-    payload = case_data.copy()
-    payload["issue_type"] = serialize_list(case_data.get("issue_type", []))
-    payload["api_supported"] = serialize_list(case_data.get("api_supported", []))
-    payload["feedback_received"] = 1 if case_data.get("feedback_received") else 0
-    payload["case_id"] = case_id
+    def merge_updates(conn: sqlite3.Connection, chunk: List[Dict[str, Any]]) -> None:
+        existing = _existing_case_ids(
+            conn, [u["case_id"] for u in chunk if u.get("case_id")]
+        )
+        update_ids = [u["id"] for u in chunk if u.get("id") is not None]
+        stored = _stored_update_hashes(conn, update_ids)
+        archived = _archived_update_ids(
+            conn, [update_id for update_id in update_ids if update_id not in stored]
+        )
+        to_create, to_update = [], []
+        for update in chunk:
+            update = {**update, "id": update.get("id")}
+            if update.get("case_id") not in existing or update["id"] in archived:
+                # An archived update's ID is taken: a live copy would hide
+                # the archived row and block archiving its case again.
+                counts["skipped_updates"] += 1
+            elif update["id"] not in stored:
+                to_create.append(update)
+            else:
+                stored_case_id, stored_hash = stored[update["id"]]
+                if stored_hash == _update_hash(update):
+                    counts["unchanged_updates"] += 1
+                    continue
+                to_update.append(update)
+                touched.append(stored_case_id)
+        written = _insert_updates(conn, to_create, _INSERT_UPDATE_WITH_ID_SQL)
+        conn.executemany(_UPDATE_UPDATE_SQL, to_update)
+        counts["created_updates"] += written
+        counts["skipped_updates"] += len(to_create) - written
+        counts["updated_updates"] += len(to_update)
+        touched.extend(u["case_id"] for u in to_create + to_update)
 
-    with get_connection() as conn:
-        conn.execute(
-            """
-            UPDATE cases
-            SET
-                seller_id = :seller_id,
-                seller_name = :seller_name,
-                specialist_id = :specialist_id,
-                specialist_name = :specialist_name,
-                marketplace = :marketplace,
-                case_source = :case_source,
-                case_status = :case_status,
-                workstream = :workstream,
-                listing_start_date = :listing_start_date,
-                listing_completion_date = :listing_completion_date,
-                issue_type = :issue_type,
-                complexity = :complexity,
-                priority = :priority,
-                api_supported = :api_supported,
-                integration_type = :integration_type,
-                seller_type = :seller_type,
-                feedback_received = :feedback_received,
-                csat_score = :csat_score,
-                notes = :notes,
-                last_sub_status = :last_sub_status
-            WHERE case_id = :case_id
-            """,
-            payload,
+    if mode == "merge":
+        case_writer, update_writer = merge_cases, merge_updates
+    else:
+        case_writer, update_writer = write_cases, write_updates
+    for chunk in case_chunks:
+        run_write(lambda conn: case_writer(conn, chunk))
+    for chunk in update_chunks:
+        run_write(lambda conn: update_writer(conn, chunk))
+    if merged:
+        run_write(
+            lambda conn: refresh_last_sub_status(conn, merged, with_updates_only=True)
         )
+    if touched:
+        run_write(lambda conn: refresh_last_sub_status(conn, touched))
 
+    return counts
 
-def delete_case(case_id: str) -> None:
-    with get_connection() as conn:
-        conn.execute("DELETE FROM cases WHERE case_id = ?", (case_id,))
 
+# Fields compared by the merge import, in hashing order.
+_CASE_CONTENT_FIELDS = CASE_FIELDS[1:]
+_UPDATE_CONTENT_FIELDS = ("case_id", "note", "updated_by", "timestamp", "sub_status")
 
-def list_updates(case_id: Optional[str] = None) -> List[Dict[str, Any]]:
-    query = "SELECT * FROM updates"
-    params: Tuple[Any, ...] = ()
-    if case_id:
-        query += " WHERE case_id = ?"
-        params = (case_id,)
-    query += " ORDER BY datetime(timestamp) DESC, id DESC"
 
-    with get_connection() as conn:
-        rows = conn.execute(query, params).fetchall()
+def _content_hash(values: Iterable[Any]) -> bytes:
+    """Digest of a row's field values, with NULL and "" hashing alike (the
+    import reads empty cells as "" where the forms store NULL)."""
+    text = repr(["" if value is None else value for value in values])
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
 
-    return [dict(row) for row in rows]
 
+def _case_hash(payload: Dict[str, Any]) -> bytes:
+    return _content_hash(payload.get(field) for field in _CASE_CONTENT_FIELDS)
 
-def create_update(update_data: Dict[str, Any]) -> int:
-    with get_connection() as conn:
-        cursor = conn.execute(
-            """
-            INSERT INTO updates (case_id, note, updated_by, timestamp, sub_status)
-            VALUES (:case_id, :note, :updated_by, :timestamp, :sub_status)
+
+def _update_hash(update: Dict[str, Any]) -> bytes:
+    return _content_hash(update.get(field) for field in _UPDATE_CONTENT_FIELDS)
+
+
+def _stored_case_hashes(
+    conn: sqlite3.Connection, case_ids: List[str]
+) -> Dict[str, bytes]:
+    """Content hashes of the live cases among ``case_ids``.
+
+    List fields are read back ", "-joined from the junction tables, the same
+    form ``_case_payload`` gives imported rows.
+    """
+    hashes: Dict[str, bytes] = {}
+    for chunk in _chunked(case_ids, SQL_PARAM_CHUNK):
+        placeholders = ", ".join("?" for _ in chunk)
+        rows = _tuple_cursor(conn).execute(
+            f"""
+            SELECT {_CASE_FRAME_SELECT_SQL["main"]}
+            FROM main.cases AS cases
+            WHERE cases.case_id IN ({placeholders})
             """,
-            update_data,
+            chunk,
         )
-        update_case_last_sub_status(conn, update_data["case_id"])
-        return cursor.lastrowid
+        for row in rows:
+            hashes[row[0]] = _content_hash(row[1:])
+    return hashes
 
 
-def update_update(update_id: int, update_data: Dict[str, Any]) -> None:
-    with get_connection() as conn:
+def _stored_update_hashes(
+    conn: sqlite3.Connection, update_ids: List[int]
+) -> Dict[int, Tuple[str, bytes]]:
+    """(case_id, content hash) of the live updates among ``update_ids``."""
+    hashes: Dict[int, Tuple[str, bytes]] = {}
+    for chunk in _chunked(list(dict.fromkeys(update_ids)), SQL_PARAM_CHUNK):
+        placeholders = ", ".join("?" for _ in chunk)
+        rows = _tuple_cursor(conn).execute(
+            f"SELECT {_UPDATE_COLUMNS_SQL} FROM updates WHERE id IN ({placeholders})",
+            chunk,
+        )
+        for row in rows:
+            hashes[row[0]] = (row[1], _content_hash(row[1:]))
+    return hashes
+
+
+def _archived_case_ids(conn: sqlite3.Connection, case_ids: List[str]) -> Set[str]:
+    archived: Set[str] = set()
+    for chunk in _chunked(case_ids, SQL_PARAM_CHUNK):
+        placeholders = ", ".join("?" for _ in chunk)
+        rows = conn.execute(
+            f"SELECT case_id FROM archive.cases WHERE case_id IN ({placeholders})",
+            chunk,
+        ).fetchall()
+        archived.update(row["case_id"] for row in rows)
+    return archived
+
+
+def _archived_update_ids(conn: sqlite3.Connection, update_ids: List[int]) -> Set[int]:
+    archived: Set[int] = set()
+    for chunk in _chunked(list(dict.fromkeys(update_ids)), SQL_PARAM_CHUNK):
+        placeholders = ", ".join("?" for _ in chunk)
+        rows = conn.execute(
+            f"SELECT id FROM archive.updates WHERE id IN ({placeholders})", chunk
+        ).fetchall()
+        archived.update(row["id"] for row in rows)
+    return archived
+
+
+_ARCHIVE_CANDIDATES_SQL = f"""
+    SELECT case_id
+    FROM main.cases AS cases
+    WHERE case_status IN ({", ".join("?" * len(CLOSED_CASE_STATUSES))})
+      AND COALESCE(
+          (SELECT MAX(ts_epoch) FROM main.updates
+           WHERE updates.case_id = cases.case_id),
+          CAST(strftime('%s', listing_completion_date) AS INTEGER),
+          CAST(strftime('%s', listing_start_date) AS INTEGER),
+          0
+      ) < ?
+      AND case_id NOT IN (SELECT case_id FROM archive.cases)
+    LIMIT ?
+"""
+
+
+def archive_closed_cases(
+    older_than_days: Optional[int] = None, batch_size: int = ARCHIVE_BATCH_SIZE
+) -> int:
+    """Move closed cases idle for ``older_than_days`` into the archive.
+
+    A case qualifies when its status is one of ``CLOSED_CASE_STATUSES`` and
+    its last activity (newest update, else completion or start date) is older
+    than the cutoff. Cases move with their updates and list rows in batches,
+    each copied and then deleted in separate write transactions: SQLite does
+    not commit attached WAL databases atomically, so a case is only removed
+    from ``main`` once its archive copy is durable. A case edited between the
+    two steps stays live and its copy is dropped. Existing archive rows are
+    never replaced: a live case whose ID is already archived is only removed
+    when it matches its archived copy (a copy whose removal step was
+    interrupted), and is otherwise left live. Returns the number of cases
+    archived (``ARCHIVE_AFTER_DAYS`` is used when ``older_than_days`` is
+    ``None``).
+    """
+    days = ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    cutoff = int(time.time()) - days * 86400
+    limit = max(1, min(batch_size, SQL_PARAM_CHUNK))
+
+    archived = run_write(_finish_interrupted_archive)
+    while True:
+        case_ids = run_write(lambda conn: _copy_to_archive(conn, cutoff, limit))
+        if not case_ids:
+            break
+        moved = run_write(lambda conn: _remove_archived(conn, case_ids))
+        archived += moved
+        if len(case_ids) < limit or not moved:
+            break
+    return archived
+
+
+def _copy_to_archive(conn: sqlite3.Connection, cutoff: int, limit: int) -> List[str]:
+    case_ids = [
+        row["case_id"]
+        for row in conn.execute(
+            _ARCHIVE_CANDIDATES_SQL, (*CLOSED_CASE_STATUSES, cutoff, limit)
+        ).fetchall()
+    ]
+    if not case_ids:
+        return []
+    placeholders = ", ".join("?" * len(case_ids))
+    for table in _ARCHIVE_TABLES:
+        columns = ", ".join(_table_columns(conn, "main", table))
         conn.execute(
-            """
-            UPDATE updates
-            SET
-                case_id = :case_id,
-                note = :note,
-                updated_by = :updated_by,
-                timestamp = :timestamp,
-                sub_status = :sub_status
-            WHERE id = :id
+            f"INSERT INTO archive.{table} ({columns}) "
+            f"SELECT {columns} FROM main.{table} WHERE case_id IN ({placeholders})",
+            case_ids,
+        )
+    return case_ids
+
+
+def _remove_archived(conn: sqlite3.Connection, case_ids: List[str]) -> int:
+    """Delete copied cases from ``main`` unless they changed since the copy.
+
+    ``case_ids`` must be the ones just copied by ``_copy_to_archive``: the
+    archive rows of any that were deleted or changed meanwhile are dropped.
+    """
+    placeholders = ", ".join("?" * len(case_ids))
+    # Copies of cases deleted in the meantime.
+    for table in _ARCHIVE_TABLES:
+        conn.execute(
+            f"""
+            DELETE FROM archive.{table}
+            WHERE case_id IN ({placeholders})
+              AND case_id NOT IN (SELECT case_id FROM main.cases)
             """,
-            {**update_data, "id": update_id},
+            case_ids,
         )
-        update_case_last_sub_status(conn, update_data["case_id"])
+    removed = _delete_matching_copies(conn, case_ids)
+    # Copies of cases that changed and therefore stay live.
+    for table in _ARCHIVE_TABLES:
+        conn.execute(
+            f"""
+            DELETE FROM archive.{table}
+            WHERE case_id IN ({placeholders})
+              AND case_id IN (SELECT case_id FROM main.cases)
+            """,
+            case_ids,
+        )
+    return removed
 
 
-def delete_update(update_id: int) -> None:
+def _finish_interrupted_archive(conn: sqlite3.Connection) -> int:
+    """Remove live cases whose archive copy is complete and identical.
+
+    These are left behind when the removal step of an earlier run did not
+    commit. Live cases that merely share an archived ID are left alone.
+    """
+    case_ids = [
+        row["case_id"]
+        for row in conn.execute(
+            "SELECT case_id FROM main.cases "
+            "WHERE case_id IN (SELECT case_id FROM archive.cases)"
+        ).fetchall()
+    ]
+    removed = 0
+    for chunk in _chunked(case_ids, SQL_PARAM_CHUNK):
+        removed += _delete_matching_copies(conn, chunk)
+    return removed
+
+
+def _delete_matching_copies(conn: sqlite3.Connection, case_ids: List[str]) -> int:
+    """Delete the ``case_ids`` from ``main`` whose case and updates all have
+    identical archive copies; archive rows are not touched."""
+    placeholders = ", ".join("?" * len(case_ids))
+    case_columns = ", ".join(
+        f"cases.{column}" for column in _table_columns(conn, "main", "cases")
+    )
+    update_columns = ", ".join(
+        f"updates.{column}" for column in _table_columns(conn, "main", "updates")
+    )
+    return conn.execute(
+        f"""
+        DELETE FROM main.cases
+        WHERE case_id IN ({placeholders})
+          AND EXISTS (
+              SELECT 1 FROM archive.cases AS copy
+              WHERE copy.case_id = cases.case_id
+                AND ({case_columns.replace("cases.", "copy.")}) IS ({case_columns})
+          )
+          AND NOT EXISTS (
+              SELECT 1 FROM main.updates
+              WHERE updates.case_id = cases.case_id
+                AND NOT EXISTS (
+                    SELECT 1 FROM archive.updates AS copy
+                    WHERE copy.id = updates.id
+                      AND ({update_columns.replace("updates.", "copy.")})
+                          IS ({update_columns})
+                )
+          )
+        """,
+        case_ids,
+    ).rowcount
+
+
+class Change(NamedTuple):
+    version: int
+    entity: str
+    key: Any
+    deleted: bool
+    changed_at: str
+    row: Optional[Dict[str, Any]]
+
+
+_CHANGE_KEYS_SQL = """
+    SELECT * FROM (
+        SELECT row_version AS version, 'case' AS entity, case_id AS key,
+               0 AS deleted, updated_at AS changed_at
+        FROM cases WHERE row_version > :version
+        ORDER BY row_version LIMIT :limit
+    )
+    UNION ALL SELECT * FROM (
+        SELECT row_version, 'update', id, 0, updated_at
+        FROM updates WHERE row_version > :version
+        ORDER BY row_version LIMIT :limit
+    )
+    UNION ALL SELECT * FROM (
+        SELECT version, entity, COALESCE(update_id, case_id), 1, deleted_at
+        FROM tombstones WHERE version > :version
+        ORDER BY version LIMIT :limit
+    )
+    ORDER BY version LIMIT :limit
+"""
+
+
+@_cached_read
+def current_version() -> int:
+    """Return the last version issued by the change feed."""
     with get_connection() as conn:
-        row = conn.execute(
-            "SELECT case_id FROM updates WHERE id = ?", (update_id,)
-        ).fetchone()
-        if not row:
+        return conn.execute("SELECT version FROM change_seq").fetchone()[0]
+
+
+def changes_since(version: int = 0, batch_size: int = 1000) -> Iterator[Change]:
+    """Yield case and update changes after ``version`` in version order.
+
+    Each ``Change`` carries the row as it is now (cases shaped like
+    ``get_case``, updates like ``get_update``, both with ``row_version`` and
+    ``updated_at``), or ``deleted=True`` and no row for a tombstone; archived
+    cases show up as deletes. A row changed again while streaming is only
+    yielded at its newest version. Resume a sync from the ``version`` of the
+    last change processed.
+    """
+    limit = max(1, min(batch_size, SQL_PARAM_CHUNK))
+    while True:
+        with get_connection() as conn:
+            keys = conn.execute(
+                _CHANGE_KEYS_SQL, {"version": version, "limit": limit}
+            ).fetchall()
+            rows = {
+                entity: _changed_rows(
+                    conn,
+                    entity,
+                    [
+                        key["key"]
+                        for key in keys
+                        if key["entity"] == entity and not key["deleted"]
+                    ],
+                )
+                for entity in _VERSIONED_TABLES.values()
+            }
+
+        for key in keys:
+            version = key["version"]
+            if key["deleted"]:
+                yield Change(
+                    version, key["entity"], key["key"], True, key["changed_at"], None
+                )
+                continue
+            row = rows[key["entity"]].get(key["key"])
+            if row is not None and row["row_version"] == version:
+                yield Change(
+                    version, key["entity"], key["key"], False, row["updated_at"], row
+                )
+        if len(keys) < limit:
             return
-        case_id = row["case_id"]
-        conn.execute("DELETE FROM updates WHERE id = ?", (update_id,))
-        update_case_last_sub_status(conn, case_id)
 
 
-def update_case_last_sub_status(conn: sqlite3.Connection, case_id: str) -> None:
-    latest = conn.execute(
+def _changed_rows(
+    conn: sqlite3.Connection, entity: str, keys: List[Any]
+) -> Dict[Any, Dict[str, Any]]:
+    if not keys:
+        return {}
+    placeholders = ", ".join("?" * len(keys))
+    if entity == "case":
+        rows = conn.execute(
+            f"SELECT {_CASE_SELECT_SQL['main']}, cases.row_version, cases.updated_at "
+            f"FROM cases WHERE case_id IN ({placeholders})",
+            keys,
+        ).fetchall()
+        return {row["case_id"]: normalize_case_row(row) for row in rows}
+    rows = conn.execute(
+        f"SELECT {_UPDATE_COLUMNS_SQL}, row_version, updated_at "
+        f"FROM updates WHERE id IN ({placeholders})",
+        keys,
+    ).fetchall()
+    return {row["id"]: dict(row) for row in rows}
+
+
+def purge_tombstones(through_version: int) -> int:
+    """Drop tombstones up to ``through_version`` once every consumer has them."""
+    return _write_statement(
+        "DELETE FROM tombstones WHERE version <= ?", (through_version,)
+    )
+
+
+JOB_KINDS = ("export", "import", "validate")
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+_ACTIVE_JOB_STATUSES = ("queued", "running")
+_EPOCH_NOW_SQL = "CAST(strftime('%s', 'now') AS INTEGER)"
+
+
+def _create_jobs_table(conn: sqlite3.Connection) -> None:
+    """Create ``jobs``, the status record of background imports/exports.
+
+    ``rows_processed`` counts rows done in the current ``stage``; ``result``
+    is the job's JSON summary and ``artifact_path`` the file it produced.
+    """
+    _execute_script(
+        conn,
+        f"""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            stage TEXT,
+            params TEXT NOT NULL DEFAULT '{{}}',
+            rows_processed INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            result TEXT,
+            artifact_path TEXT,
+            created_at TEXT NOT NULL DEFAULT ({_NOW_SQL}),
+            started_at TEXT,
+            finished_at TEXT
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+        CREATE INDEX IF NOT EXISTS idx_jobs_finished_at ON jobs(finished_at);
+        """,
+    )
+
+
+def _add_job_heartbeats(conn: sqlite3.Connection) -> None:
+    """Add ``jobs.heartbeat_at``, the epoch second at which the process
+    running a queued/running job last reported it alive."""
+    _ensure_column(conn, "jobs", "heartbeat_at", "INTEGER")
+
+
+# Schema migrations in order; the database's ``PRAGMA user_version`` is the
+# number applied so far. Append new ones (never edit or reorder shipped
+# ones); each runs once per database, but databases created before
+# versioning replay them all, so they must tolerate existing objects.
+SCHEMA_MIGRATIONS: List[Callable[[sqlite3.Connection], None]] = [
+    _create_base_tables,
+    _create_base_indexes,
+    _create_search_index,
+    _create_status_counts,
+    _create_case_list_tables,
+    _create_change_feed,
+    _create_jobs_table,
+    _seed_default_options,
+    _add_job_heartbeats,
+    _create_order_indexes,
+]
+
+
+def _job_row(row: sqlite3.Row) -> Dict[str, Any]:
+    job = dict(row)
+    job["params"] = json.loads(job["params"])
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+
+def create_job(kind: str, params: Optional[Dict[str, Any]] = None) -> int:
+    """Record a queued job and return its id."""
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    return run_write(
+        lambda conn: conn.execute(
+            f"""
+            INSERT INTO jobs(kind, params, heartbeat_at)
+            VALUES (?, ?, {_EPOCH_NOW_SQL})
+            """,
+            (kind, json.dumps(params or {}, default=str)),
+        ).lastrowid,
+        invalidate=False,
+    )
+
+
+def start_job(job_id: int, stage: Optional[str] = None) -> None:
+    _write_statement(
+        f"""
+        UPDATE jobs
+        SET status = 'running', stage = ?, rows_processed = 0,
+            started_at = COALESCE(started_at, {_NOW_SQL})
+        WHERE id = ?
+        """,
+        (stage, job_id),
+        invalidate=False,
+    )
+
+
+def update_job_progress(
+    job_id: int, rows_processed: int, stage: Optional[str] = None
+) -> None:
+    _write_statement(
         """
-        SELECT sub_status
-        FROM updates
-        WHERE case_id = ?
-        ORDER BY datetime(timestamp) DESC, id DESC
-        LIMIT 1
+        UPDATE jobs SET rows_processed = ?, stage = COALESCE(?, stage)
+        WHERE id = ?
         """,
-        (case_id,),
-    ).fetchone()
+        (rows_processed, stage, job_id),
+        invalidate=False,
+    )
 
-    new_status = latest["sub_status"] if latest else None
-    conn.execute(
-        "UPDATE cases SET last_sub_status = ? WHERE case_id = ?",
-        (new_status, case_id),
+
+def finish_job(
+    job_id: int,
+    result: Optional[Dict[str, Any]] = None,
+    artifact_path: Optional[str] = None,
+) -> None:
+    _write_statement(
+        f"""
+        UPDATE jobs
+        SET status = 'succeeded', result = ?, artifact_path = ?,
+            finished_at = {_NOW_SQL}
+        WHERE id = ?
+        """,
+        (json.dumps(result) if result is not None else None, artifact_path, job_id),
+        invalidate=False,
+    )
+
+
+def fail_job(
+    job_id: int,
+    error: str,
+    result: Optional[Dict[str, Any]] = None,
+    artifact_path: Optional[str] = None,
+) -> None:
+    _write_statement(
+        f"""
+        UPDATE jobs
+        SET status = 'failed', error = ?, result = ?, artifact_path = ?,
+            finished_at = {_NOW_SQL}
+        WHERE id = ?
+        """,
+        (
+            error,
+            json.dumps(result) if result is not None else None,
+            artifact_path,
+            job_id,
+        ),
+        invalidate=False,
+    )
+
+
+def touch_jobs(job_ids: List[int]) -> None:
+    """Refresh the heartbeat of the active jobs among ``job_ids``."""
+    placeholders = ", ".join("?" for _ in job_ids)
+    _write_statement(
+        f"""
+        UPDATE jobs SET heartbeat_at = {_EPOCH_NOW_SQL}
+        WHERE id IN ({placeholders}) AND status IN {_ACTIVE_JOB_STATUSES}
+        """,
+        job_ids,
+        invalidate=False,
+    )
+
+
+def fail_interrupted_jobs(stale_after: int) -> int:
+    """Fail queued or running jobs with no heartbeat for ``stale_after``
+    seconds, i.e. whose process has exited; jobs of other live processes
+    sharing the database keep running."""
+    return _write_statement(
+        f"""
+        UPDATE jobs
+        SET status = 'failed', error = ?, finished_at = {_NOW_SQL}
+        WHERE status IN {_ACTIVE_JOB_STATUSES}
+            AND COALESCE(heartbeat_at, 0) < {_EPOCH_NOW_SQL} - ?
+        """,
+        ("Interrupted: the app process running it stopped.", stale_after),
+        invalidate=False,
     )
 
 
+def get_job(job_id: int) -> Optional[Dict[str, Any]]:
+    with get_connection() as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return _job_row(row) if row else None
+
+
+def list_jobs(limit: int = 20) -> List[Dict[str, Any]]:
+    """Return the most recent jobs, newest first."""
+    with get_connection() as conn:
+        rows = conn.execute(
+            "SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,)
+        ).fetchall()
+    return [_job_row(row) for row in rows]
+
+
+def purge_jobs(finished_before: str) -> List[Dict[str, Any]]:
+    """Delete jobs that finished before ``finished_before`` (ISO timestamp)
+    and return them, so the caller can remove their artifacts."""
+
+    def write(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+        rows = conn.execute(
+            "SELECT * FROM jobs WHERE finished_at < ?", (finished_before,)
+        ).fetchall()
+        conn.execute("DELETE FROM jobs WHERE finished_at < ?", (finished_before,))
+        return [_job_row(row) for row in rows]
+
+    return run_write(write, invalidate=False)
+
+
+@_cached_read
 def fetch_summary_counts() -> Dict[str, int]:
     with get_connection() as conn:
-        total = conn.execute("SELECT COUNT(*) FROM cases").fetchone()[0]
         statuses = conn.execute(
-            """
-            SELECT case_status, COUNT(*) as cnt
-            FROM cases
-            GROUP BY case_status
-            """
+            "SELECT case_status, cnt FROM case_status_counts"
         ).fetchall()
 
     counts = {
-        "total": total,
+        "total": sum(row["cnt"] for row in statuses),
         "SUBMITTED": 0,
         "AWAITING INFORMATION": 0,
         "CANCELLED": 0,
@@ -336,6 +3076,7 @@ def fetch_summary_counts() -> Dict[str, int]:
     return counts
 
 
+@_cached_read
 def list_api_options() -> List[str]:
     with get_connection() as conn:
         rows = conn.execute(
@@ -344,6 +3085,7 @@ def list_api_options() -> List[str]:
     return [row["name"] for row in rows]
 
 
+@_cached_read
 def list_issue_options() -> List[str]:
     with get_connection() as conn:
         rows = conn.execute(
@@ -355,14 +3097,77 @@ def list_issue_options() -> List[str]:
 def add_api_option(name: str) -> None:
     if not name:
         return
-    with get_connection() as conn:
-        conn.execute("INSERT OR IGNORE INTO api_options(name) VALUES (?)", (name,))
+    _write_statement("INSERT OR IGNORE INTO api_options(name) VALUES (?)", (name,))
 
 
 def add_issue_option(name: str) -> None:
     if not name:
         return
+    _write_statement("INSERT OR IGNORE INTO issue_options(name) VALUES (?)", (name,))
+
+
+def explain_query_plan(query: str, params: Any = ()) -> List[str]:
     with get_connection() as conn:
-        conn.execute(
-            "INSERT OR IGNORE INTO issue_options(name) VALUES (?)", (name,)
-        )
\ No newline at end of file
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+    return [row["detail"] for row in rows]
+
+
+def verify_query_plans() -> Dict[str, List[str]]:
+    """Check that the hot case/update reads and writes are served by indexes.
+
+    The probed queries are built by the same helpers the readers use, for
+    every sort order, on the first and a later page. Returns the plan of
+    each, or raises ``RuntimeError`` naming any query that scans a whole
+    table or sorts through a temporary B-tree. Walking ``updates`` in rowid
+    order is allowed for the newest-IDs-first page, which stops at its LIMIT.
+    """
+    queries: Dict[str, Tuple[str, Any]] = {}
+    ordered_scans = set()
+    with get_connection() as conn:
+        queries["list_cases()"] = _cases_query(conn, {}, False, _CASE_SELECT_SQL)
+        for sort_by in CASE_SORT_COLUMNS:
+            for cursor in (None, ("", "")):
+                sources, params = _case_sources(conn, {}, False)
+                query = _cases_page_query(
+                    sources, params, _CASE_FRAME_SELECT_SQL, sort_by, True, cursor
+                )
+                params["page_limit"] = DEFAULT_PAGE_SIZE
+                queries[f"list_cases_page({sort_by}, cursor={cursor})"] = (
+                    query,
+                    params,
+                )
+    queries["list_case_ids()"] = (_CASE_IDS_SQL, ())
+    for case_id in (None, "?"):
+        queries[f"list_updates({case_id})"] = _updates_query(case_id, False)
+        for sort_by in UPDATE_SORT_COLUMNS:
+            for cursor in (None, (0, 0)):
+                sources, params = _update_sources(case_id, False)
+                query = _updates_page_query(sources, params, sort_by, True, cursor)
+                params["page_limit"] = DEFAULT_PAGE_SIZE
+                name = f"list_updates_page({case_id}, {sort_by}, cursor={cursor})"
+                queries[name] = (query, params)
+                if case_id is None and sort_by == "id" and cursor is None:
+                    ordered_scans.add(name)
+    for with_updates_only in (False, True):
+        name = f"refresh_last_sub_status(with_updates_only={with_updates_only})"
+        queries[name] = (_refresh_sub_status_sql(1, with_updates_only), ("",))
+
+    plans: Dict[str, List[str]] = {}
+    offenders: List[str] = []
+    for name, (query, params) in queries.items():
+        plan = explain_query_plan(query, params)
+        plans[name] = plan
+        for detail in plan:
+            # "SCAN (subquery-N)" reads a subquery's few rows, not a table.
+            full_scan = (
+                detail.startswith("SCAN ")
+                and not detail.startswith("SCAN (")
+                and " INDEX " not in detail
+                and name not in ordered_scans
+            )
+            if full_scan or "TEMP B-TREE" in detail:
+                offenders.append(f"{name}: {detail}")
+
+    if offenders:
+        raise RuntimeError("Queries not served by an index: " + "; ".join(offenders))
+    return plans
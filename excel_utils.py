@@ -1,8 +1,35 @@
+import csv
 import io
+import os
+import posixpath
+import threading
+import zipfile
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from itertools import islice
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
 
 
 CASE_COLUMNS = [
@@ -39,62 +66,245 @@ UPDATE_COLUMNS = [
 ]
 
 
-def build_export_workbook(
-    cases: List[Dict], updates: List[Dict]
-) -> bytes:
-    buffer = io.BytesIO()
-
-    cases_df = pd.DataFrame(
+# Export header -> db column, in sheet order.
+CASE_COLUMN_FIELDS = dict(
+    zip(
+        CASE_COLUMNS,
         [
-            {
-                "Case ID": c["case_id"],
-                "Seller ID": c["seller_id"],
-                "Seller Name": c["seller_name"],
-                "Specialist ID": c["specialist_id"],
-                "Specialist Name": c["specialist_name"],
-                "Marketplace": c["marketplace"],
-                "Case Source": c["case_source"],
-                "Case Status": c["case_status"],
-                "Workstream": c["workstream"],
-                "Listing Start Date": c.get("listing_start_date") or "",
-                "Listing Completion Date": c.get("listing_completion_date") or "",
-                "Issue Type": ", ".join(c.get("issue_type", [])),
-                "Complexity": c["complexity"],
-                "Priority": c["priority"],
-                "API Supported": ", ".join(c.get("api_supported", [])),
-                "Integration Type": c["integration_type"],
-                "Seller Type": c["seller_type"],
-                "Feedback Received": "Yes" if c.get("feedback_received") else "No",
-                "CSAT Score": c.get("csat_score") or "",
-                "Notes": c.get("notes") or "",
-                "Last Sub-Status": c.get("last_sub_status") or "",
-            }
-            for c in cases
-        ]
+            "case_id",
+            "seller_id",
+            "seller_name",
+            "specialist_id",
+            "specialist_name",
+            "marketplace",
+            "case_source",
+            "case_status",
+            "workstream",
+            "listing_start_date",
+            "listing_completion_date",
+            "issue_type",
+            "complexity",
+            "priority",
+            "api_supported",
+            "integration_type",
+            "seller_type",
+            "feedback_received",
+            "csat_score",
+            "notes",
+            "last_sub_status",
+        ],
     )
+)
 
-    updates_df = pd.DataFrame(
-        [
-            {
-                "ID": u["id"],
-                "Case ID": u["case_id"],
-                "Note": u["note"],
-                "Updated By": u["updated_by"],
-                "Timestamp": u["timestamp"],
-                "Sub Status": u["sub_status"],
-            }
-            for u in updates
-        ]
+UPDATE_COLUMN_FIELDS = dict(
+    zip(
+        UPDATE_COLUMNS,
+        ["id", "case_id", "note", "updated_by", "timestamp", "sub_status"],
     )
+)
 
-    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-        cases_df.to_excel(writer, index=False, sheet_name="Cases")
-        updates_df.to_excel(writer, index=False, sheet_name="Updates")
+# Columns written as "" when empty (or, for CSAT Score, when zero).
+_BLANKABLE_CASE_COLUMNS = [
+    "Listing Start Date",
+    "Listing Completion Date",
+    "CSAT Score",
+    "Notes",
+    "Last Sub-Status",
+]
+
+
+_BLANKABLE_CASE_INDEXES = [
+    CASE_COLUMNS.index(header) for header in _BLANKABLE_CASE_COLUMNS
+]
+_FEEDBACK_INDEX = CASE_COLUMNS.index("Feedback Received")
+_LIST_INDEXES = [
+    CASE_COLUMNS.index("Issue Type"),
+    CASE_COLUMNS.index("API Supported"),
+]
+
+
+def export_case_rows(rows: Iterable[Sequence[Any]]) -> Iterator[List[Any]]:
+    """Map raw case rows (``CASE_COLUMN_FIELDS`` order, as yielded by
+    ``db.iter_case_rows``) onto export sheet values, one row at a time."""
+    for row in rows:
+        values = list(row)
+        values[_FEEDBACK_INDEX] = "Yes" if values[_FEEDBACK_INDEX] else "No"
+        for index in _LIST_INDEXES:
+            if values[index] is None:
+                values[index] = ""
+        for index in _BLANKABLE_CASE_INDEXES:
+            if values[index] is None or values[index] == 0 or values[index] == "":
+                values[index] = ""
+        yield values
+
+
+def write_export_workbook(
+    target: Union[str, IO[bytes]],
+    case_rows: Iterable[Sequence[Any]],
+    update_rows: Iterable[Sequence[Any]],
+) -> None:
+    """Write the Cases/Updates export to ``target`` (a path or binary file).
+
+    Rows must already hold sheet values in ``CASE_COLUMNS`` /
+    ``UPDATE_COLUMNS`` order. The workbook is written in openpyxl's
+    write-only mode, so memory stays flat however many rows are streamed in.
+    """
+    workbook = Workbook(write_only=True)
+    for title, headers, rows in (
+        ("Cases", CASE_COLUMNS, case_rows),
+        ("Updates", UPDATE_COLUMNS, update_rows),
+    ):
+        sheet = workbook.create_sheet(title)
+        sheet.append([_header_cell(sheet, header) for header in headers])
+        for row in rows:
+            sheet.append(row)
+    workbook.save(target)
+
+
+def _header_cell(sheet, header: str) -> WriteOnlyCell:
+    cell = WriteOnlyCell(sheet, value=header)
+    cell.font = Font(bold=True)
+    return cell
+
+
+# File formats for bulk export/import besides xlsx. Each export is a zip
+# holding one file per dataset, e.g. Cases.csv and Updates.csv.
+TABLE_FORMATS = ("csv", "parquet")
+
+# Parquet column types; every other column is stored as a string.
+_PARQUET_TYPES = {
+    "Seller ID": pa.int64(),
+    "CSAT Score": pa.float64(),
+    "ID": pa.int64(),
+}
+
+
+def write_export(
+    target: Union[str, IO[bytes]],
+    file_format: str,
+    case_rows: Iterable[Sequence[Any]],
+    update_rows: Iterable[Sequence[Any]],
+) -> None:
+    """Write the Cases/Updates export to ``target`` as "xlsx", "csv" or
+    "parquet". Rows are streamed as in ``write_export_workbook``."""
+    if file_format == "xlsx":
+        write_export_workbook(target, case_rows, update_rows)
+    elif file_format in TABLE_FORMATS:
+        write_export_tables(target, file_format, case_rows, update_rows)
+    else:
+        raise ValueError(f"Unknown export format: {file_format}")
+
+
+def write_export_tables(
+    target: Union[str, IO[bytes]],
+    file_format: str,
+    case_rows: Iterable[Sequence[Any]],
+    update_rows: Iterable[Sequence[Any]],
+) -> None:
+    """Write the Cases/Updates export as a zip of two CSV or Parquet files.
+
+    Columns and cell values match the Excel export. CSV rows are written
+    one at a time; Parquet rows are written in zstd-compressed row groups of
+    ``IMPORT_CHUNK_SIZE`` rows.
+    """
+    # Parquet is compressed already; deflating it again only costs time.
+    compression = zipfile.ZIP_DEFLATED if file_format == "csv" else zipfile.ZIP_STORED
+    with zipfile.ZipFile(target, "w", compression=compression) as archive:
+        for title, headers, rows in (
+            ("Cases", CASE_COLUMNS, case_rows),
+            ("Updates", UPDATE_COLUMNS, update_rows),
+        ):
+            with archive.open(f"{title}.{file_format}", "w") as member:
+                if file_format == "csv":
+                    _write_csv(member, headers, rows)
+                else:
+                    _write_parquet(member, headers, rows)
+
+
+def _write_csv(
+    target: IO[bytes], headers: List[str], rows: Iterable[Sequence[Any]]
+) -> None:
+    text = io.TextIOWrapper(target, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    writer.writerow(headers)
+    writer.writerows(rows)
+    text.flush()
+    text.detach()
+
+
+def _write_parquet(
+    target: IO[bytes], headers: List[str], rows: Iterable[Sequence[Any]]
+) -> None:
+    schema = pa.schema(
+        [(header, _PARQUET_TYPES.get(header, pa.string())) for header in headers]
+    )
+    rows = iter(rows)
+    with pq.ParquetWriter(target, schema, compression="zstd") as writer:
+        while True:
+            chunk = list(islice(rows, IMPORT_CHUNK_SIZE))
+            if not chunk:
+                break
+            columns = zip(*chunk)
+            writer.write_batch(
+                pa.record_batch(
+                    [
+                        pa.array(_parquet_values(column, field.type), field.type)
+                        for column, field in zip(columns, schema)
+                    ],
+                    schema=schema,
+                )
+            )
 
-    buffer.seek(0)
-    return buffer.getvalue()
 
+def _parquet_values(values: Sequence[Any], data_type: pa.DataType) -> List[Any]:
+    # Export rows hold "" for blank cells; numeric columns store them as null.
+    if data_type == pa.string():
+        return [value if value is None else str(value) for value in values]
+    return [None if value == "" else value for value in values]
 
+
+EXPORT_CACHE_MAX_BYTES = (
+    int(os.environ.get("CASE_MGMT_EXPORT_CACHE_MB", "64")) * 1024 * 1024
+)
+
+
+class ExportCache:
+    """Finished export files, keyed by what they were built from.
+
+    Callers key entries on everything the file depends on (filters, format
+    and the database change version), so an entry never needs invalidating;
+    stale ones simply stop being asked for. Least recently used files are
+    evicted once the cached bytes exceed ``max_bytes``, and a file larger
+    than the whole budget is not kept at all. Safe to share across sessions.
+    """
+
+    def __init__(self, max_bytes: int = EXPORT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._files: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            data = self._files.get(key)
+            if data is not None:
+                self._files.move_to_end(key)
+            return data
+
+    def put(self, key: Hashable, data: bytes) -> None:
+        with self._lock:
+            if key in self._files:
+                self._size -= len(self._files.pop(key))
+            if len(data) > self.max_bytes:
+                return
+            self._files[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._files.popitem(last=False)
+                self._size -= len(evicted)
+
+
+@lru_cache(maxsize=None)
 def build_empty_template() -> bytes:
     buffer = io.BytesIO()
     empty_cases = pd.DataFrame(columns=CASE_COLUMNS)
@@ -108,80 +318,485 @@ def build_empty_template() -> bytes:
     return buffer.getvalue()
 
 
-def parse_import_workbook(file) -> Tuple[List[Dict], List[Dict]]:
-    xl = pd.ExcelFile(file)
-    if "Cases" not in xl.sheet_names or "Updates" not in xl.sheet_names:
+IMPORT_CHUNK_SIZE = 5000
+
+
+class ImportValidationError(ValueError):
+    """A workbook row that cannot be imported, with its sheet and row number."""
+
+    def __init__(self, sheet: str, row: int, message: str):
+        super().__init__(f"{sheet} row {row}: {message}")
+        self.sheet = sheet
+        self.row = row
+
+
+def open_import_workbook(file) -> Workbook:
+    """Open an import workbook in read-only mode.
+
+    Rows are parsed from the file as they are iterated rather than loaded up
+    front; call ``close()`` on the result when done.
+    """
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    if "Cases" not in workbook.sheetnames or "Updates" not in workbook.sheetnames:
+        workbook.close()
         raise ValueError('Workbook must contain "Cases" and "Updates" sheets.')
+    return workbook
+
+
+class ImportTables:
+    """Cases/Updates tables read from CSV or Parquet files.
+
+    Either a zip holding ``Cases.csv``/``Updates.csv`` (or ``.parquet``) as
+    written by ``write_export_tables``, or a single file whose name says which
+    dataset it holds (a name containing "update" is the Updates table;
+    anything else is Cases). A table missing from the upload reads as empty.
+    Like a read-only workbook, each ``rows()`` call streams the table from
+    the start, header row first.
+    """
+
+    def __init__(self, file, name: str):
+        self._archive: Optional[zipfile.ZipFile] = None
+        self._members: Dict[str, Tuple[str, Callable[[], IO[bytes]]]] = {}
+        if name.lower().endswith(".zip"):
+            self._archive = zipfile.ZipFile(file)
+            for member in self._archive.namelist():
+                stem, extension = posixpath.splitext(posixpath.basename(member))
+                extension = extension.lower().lstrip(".")
+                title = stem.strip().title()
+                if title in ("Cases", "Updates") and extension in TABLE_FORMATS:
+                    self._members[title] = (
+                        extension,
+                        lambda member=member: self._archive.open(member),
+                    )
+            if not self._members:
+                self._archive.close()
+                raise ValueError(
+                    "Archive must contain a Cases and/or Updates "
+                    ".csv or .parquet file."
+                )
+        else:
+            extension = posixpath.splitext(name)[1].lower().lstrip(".")
+            if extension not in TABLE_FORMATS:
+                raise ValueError(f"Unsupported import file: {name}")
+            title = "Updates" if "update" in name.lower() else "Cases"
+            data = file.read()
+            self._members[title] = (extension, lambda: io.BytesIO(data))
+
+    def rows(self, title: str) -> Iterator[Tuple]:
+        if title not in self._members:
+            return
+        file_format, open_member = self._members[title]
+        with open_member() as member:
+            if file_format == "csv":
+                text = io.TextIOWrapper(member, encoding="utf-8-sig", newline="")
+                yield from map(tuple, csv.reader(text))
+            else:
+                table = pq.ParquetFile(member)
+                yield tuple(table.schema_arrow.names)
+                for batch in table.iter_batches(batch_size=IMPORT_CHUNK_SIZE):
+                    yield from zip(*(column.to_pylist() for column in batch.columns))
+
+    def close(self) -> None:
+        if self._archive is not None:
+            self._archive.close()
+
+
+ImportSource = Union[Workbook, ImportTables]
+
+
+def open_import_file(file, name: Optional[str] = None) -> ImportSource:
+    """Open an uploaded xlsx workbook, CSV/Parquet file or zip of them.
+
+    ``name`` (defaulting to ``file.name``) picks the format by extension.
+    Call ``close()`` on the result when done.
+    """
+    name = name or getattr(file, "name", "")
+    if name.lower().endswith((".xlsx", ".xls")):
+        return open_import_workbook(file)
+    return ImportTables(file, name)
+
+
+def iter_table_rows(source: ImportSource, title: str) -> Iterator[Tuple]:
+    """Stream the raw rows of the ``title`` sheet or table, header first."""
+    if isinstance(source, Workbook):
+        return source[title].iter_rows(values_only=True)
+    return source.rows(title)
+
+
+def iter_case_records(
+    source: ImportSource, chunk_size: int = IMPORT_CHUNK_SIZE
+) -> Iterator[List[Dict]]:
+    """Yield case records from the Cases sheet or table in chunks of
+    ``chunk_size``.
+
+    Raises ``ImportValidationError`` for the first row that cannot be read.
+    """
+    return _iter_records(source, "Cases", chunk_size)
+
+
+def iter_update_records(
+    source: ImportSource, chunk_size: int = IMPORT_CHUNK_SIZE
+) -> Iterator[List[Dict]]:
+    """Yield update records from the Updates sheet or table in chunks of
+    ``chunk_size``.
+
+    Rows without a Case ID are skipped.
+    """
+    return _iter_records(source, "Updates", chunk_size)
+
 
-    cases_df = xl.parse("Cases")
-    updates_df = xl.parse("Updates")
-
-    cases: List[Dict] = []
-    for _, row in cases_df.iterrows():
-        case_id = str(row.get("Case ID", "")).strip()
-        if not case_id:
-            raise ValueError("Each case row must include a Case ID.")
-
-        issue_type = [
-            part.strip()
-            for part in str(row.get("Issue Type", "")).split(",")
-            if part.strip()
-        ]
-        api_supported = [
-            part.strip()
-            for part in str(row.get("API Supported", "")).split(",")
-            if part.strip()
-        ]
-
-        cases.append(
-            {
-                "case_id": case_id,
-                "seller_id": int(row.get("Seller ID", 0) or 0),
-                "seller_name": str(row.get("Seller Name", "")).strip(),
-                "specialist_id": str(row.get("Specialist ID", "")).strip(),
-                "specialist_name": str(row.get("Specialist Name", "")).strip(),
-                "marketplace": str(row.get("Marketplace", "")).strip(),
-                "case_source": str(row.get("Case Source", "")).strip(),
-                "case_status": str(row.get("Case Status", "")).strip(),
-                "workstream": str(row.get("Workstream", "")).strip(),
-                "listing_start_date": _to_iso_date(row.get("Listing Start Date")),
-                "listing_completion_date": _to_iso_date(
-                    row.get("Listing Completion Date")
-                ),
-                "issue_type": issue_type,
-                "complexity": str(row.get("Complexity", "")).strip(),
-                "priority": str(row.get("Priority", "")).strip(),
-                "api_supported": api_supported,
-                "integration_type": str(row.get("Integration Type", "")).strip(),
-                "seller_type": str(row.get("Seller Type", "")).strip(),
-                "feedback_received": str(row.get("Feedback Received", "")).strip()
-                .lower()
-                .startswith("y"),
-                "csat_score": _to_float(row.get("CSAT Score")),
-                "notes": str(row.get("Notes", "")).strip(),
-                "last_sub_status": str(row.get("Last Sub-Status", "")).strip() or None,
-            }
-        )
-
-    updates: List[Dict] = []
-    for _, row in updates_df.iterrows():
-        case_id = str(row.get("Case ID", "")).strip()
-        if not case_id:
+# Raw cells of a chunk, one object Series per header.
+Cells = Dict[str, pd.Series]
+# Record columns of a chunk, one Series per record field.
+Columns = Dict[str, pd.Series]
+# Sheet rows of a chunk: headers, sheet row numbers and the padded rows.
+RawChunk = Tuple[List[str], List[int], List[Tuple]]
+
+
+def iter_raw_chunks(
+    source: ImportSource, sheet: str, chunk_size: int = IMPORT_CHUNK_SIZE
+) -> Iterator[RawChunk]:
+    """Yield the non-blank rows of ``sheet`` in chunks of ``chunk_size``,
+    padded to the header width, with their sheet row numbers."""
+    rows = iter_table_rows(source, sheet)
+    headers = [
+        str(header).strip() if header is not None else ""
+        for header in next(rows, ())
+    ]
+    width = len(headers)
+    padding = (None,) * width
+    numbers: List[int] = []
+    raw: List[Tuple] = []
+    for number, values in enumerate(rows, start=2):
+        if all(value is None or value == "" for value in values):
             continue
-        timestamp_raw = row.get("Timestamp")
-        timestamp = _to_iso_datetime(timestamp_raw)
-        updates.append(
-            {
-                "id": int(row["ID"]) if not pd.isna(row.get("ID")) else None,
-                "case_id": case_id,
-                "note": str(row.get("Note", "")).strip(),
-                "updated_by": str(row.get("Updated By", "")).strip(),
-                "timestamp": timestamp,
-                "sub_status": str(row.get("Sub Status", "")).strip(),
-            }
-        )
-
-    return cases, updates
+        if len(values) != width:
+            # Read-only sheets drop trailing empty cells.
+            values = (values + padding)[:width]
+        numbers.append(number)
+        raw.append(values)
+        if len(raw) >= chunk_size:
+            yield headers, numbers, raw
+            numbers, raw = [], []
+    if raw:
+        yield headers, numbers, raw
+
+
+def _iter_records(
+    source: ImportSource, sheet: str, chunk_size: int
+) -> Iterator[List[Dict]]:
+    for headers, numbers, raw in iter_raw_chunks(source, sheet, chunk_size):
+        records = _normalize_chunk(sheet, headers, numbers, raw)
+        if records:
+            yield records
+
+
+def normalize_rows(
+    sheet: str, headers: List[str], raw: List[Tuple]
+) -> Tuple[Cells, Columns, Dict[int, str]]:
+    """Normalize a chunk of ``sheet`` rows column by column.
+
+    Returns the raw cells and the record columns, both indexed by position
+    in ``raw`` (Updates rows without a Case ID have no record), and the
+    first error of each bad row by position. Nothing is raised, so callers
+    can report every error.
+    """
+    index = pd.RangeIndex(len(raw))
+    cells = {
+        header: pd.Series(column, index=index, dtype=object)
+        for header, column in zip(headers, zip(*raw))
+        if header
+    }
+    errors: Dict[int, str] = {}
+    normalize = _case_records if sheet == "Cases" else _update_records
+    return cells, normalize(cells, index, errors), errors
+
+
+def _normalize_chunk(
+    sheet: str, headers: List[str], numbers: List[int], raw: List[Tuple]
+) -> List[Dict]:
+    """Normalize a chunk of sheet rows into records, raising the error on
+    the lowest row as ``ImportValidationError``."""
+    _, columns, errors = normalize_rows(sheet, headers, raw)
+    if errors:
+        position = min(errors)
+        raise ImportValidationError(sheet, numbers[position], errors[position])
+    fields = list(columns)
+    values = [column.tolist() for column in columns.values()]
+    return [dict(zip(fields, row)) for row in zip(*values)]
+
+
+def _cells(cells: Cells, index: pd.Index, header: str) -> pd.Series:
+    if header in cells:
+        return cells[header].loc[index]
+    return pd.Series(None, index=index, dtype=object)
+
+
+def _kinds(values: pd.Series) -> pd.Series:
+    return pd.Series(
+        [type(value) for value in values.tolist()], index=values.index, dtype=object
+    )
+
+
+_NUMBER_TYPES = [int, float, bool]
+_DATETIME_TYPES = [datetime, pd.Timestamp]
+_EXCEL_EPOCH = datetime(1899, 12, 30)
+# Excel serials within pandas' Timestamp range.
+_SERIAL_RANGE = (
+    (pd.Timestamp.min.date() - _EXCEL_EPOCH.date()).days + 1,
+    (pd.Timestamp.max.date() - _EXCEL_EPOCH.date()).days - 1,
+)
+
+
+def _put(result: np.ndarray, index: pd.Index, converted: pd.Series) -> None:
+    """Store ``converted`` (labelled by a subset of ``index``) into ``result``."""
+    if converted.empty:
+        return
+    converted = converted.sort_index()
+    result[index.isin(converted.index)] = converted.to_numpy(dtype=object)
+
+
+def _apply_cells(
+    values: pd.Series, convert: Callable[[Any], Any], errors: Dict[int, str]
+) -> pd.Series:
+    """Per-cell fallback for values the vectorized paths do not cover."""
+    converted = []
+    for position, value in values.items():
+        try:
+            converted.append(convert(value))
+        except ValueError as exc:
+            errors.setdefault(position, str(exc))
+            converted.append(None)
+    return pd.Series(converted, index=values.index, dtype=object)
+
+
+def _text_column(values: pd.Series) -> pd.Series:
+    """``str(value).strip()`` over a column, with empty cells as "".
+
+    pandas' ``.str`` methods loop over object columns in Python anyway, so a
+    plain comprehension is the fastest form here.
+    """
+    return pd.Series(
+        [
+            value.strip()
+            if type(value) is str
+            else "" if value is None else str(value).strip()
+            for value in values.tolist()
+        ],
+        index=values.index,
+        dtype=object,
+    )
+
+
+def _list_column(values: pd.Series) -> pd.Series:
+    """Split comma-separated names, dropping blanks."""
+    return pd.Series(
+        [
+            [part.strip() for part in text.split(",") if part.strip()]
+            if text
+            else []
+            for text in _text_column(values).tolist()
+        ],
+        index=values.index,
+        dtype=object,
+    )
+
+
+def _parse_date_strings(strings: pd.Series) -> Tuple[List[pd.Series], pd.Series]:
+    """Parse date strings in bulk, ISO first, then pandas' per-element
+    inference. Strings with and without a UTC offset are parsed apart, as
+    pandas refuses to mix them. Returns the parsed groups (datetime Series)
+    and the strings left for the per-cell helpers."""
+    parsed: List[pd.Series] = []
+    leftover = []
+    aware = strings.str.contains(r"(?:[+-]\d\d:?\d\d|Z)$", regex=True)
+    for group in (strings[~aware], strings[aware]):
+        pending = group
+        for date_format in ("ISO8601", "mixed"):
+            if pending.empty:
+                break
+            try:
+                stamps = pd.to_datetime(pending, errors="coerce", format=date_format)
+            except (ValueError, TypeError):
+                continue
+            done = stamps.notna()
+            parsed.append(stamps[done])
+            pending = pending[~done]
+        leftover.append(pending)
+    return parsed, pd.concat(leftover)
+
+
+def _iso_datetimes(stamps: pd.Series) -> pd.Series:
+    """``datetime.isoformat()`` for a datetime Series."""
+    if getattr(stamps.dt, "tz", None) is not None:
+        return stamps.map(lambda stamp: stamp.to_pydatetime().isoformat())
+    text = stamps.dt.strftime("%Y-%m-%dT%H:%M:%S.%f")
+    return text.str.removesuffix(".000000").astype(object)
+
+
+def _date_column(
+    values: pd.Series, label: str, errors: Dict[int, str]
+) -> pd.Series:
+    """Vectorized ``_to_iso_date``."""
+    index = values.index
+
+    def convert(value) -> str:
+        try:
+            return _to_iso_date(value)
+        except ValueError as exc:
+            raise ValueError(f"{label}: {exc}") from None
+
+    result = np.full(len(values), "", dtype=object)
+    kinds = _kinds(values)
+
+    if kinds.eq(type(None)).all():
+        return pd.Series(result, index=index, dtype=object)
+
+    dates = kinds.isin(_DATETIME_TYPES)
+    _put(result, index, values[dates].map(lambda value: value.date().isoformat()))
+
+    strings = values[kinds.eq(str)].str.strip()
+    parsed, pending = _parse_date_strings(strings[strings.ne("")])
+    for stamps in parsed:
+        _put(result, index, stamps.dt.strftime("%Y-%m-%d"))
+    _put(result, index, _apply_cells(pending, convert, errors))
+
+    numbers = kinds.isin(_NUMBER_TYPES) & values.notna()
+    floats = values[numbers].astype(float)
+    # Serials pandas cannot represent overflow rather than coerce to NaT;
+    # they are left to the per-cell helper, which reports them.
+    serials = pd.to_datetime(
+        floats[floats.between(*_SERIAL_RANGE)],
+        unit="D",
+        origin=_EXCEL_EPOCH,
+        errors="coerce",
+    )
+    valid = serials.notna()
+    _put(result, index, serials[valid].dt.strftime("%Y-%m-%d"))
+    _put(
+        result,
+        index,
+        _apply_cells(values[numbers].drop(serials.index[valid]), convert, errors),
+    )
+
+    other = ~(dates | kinds.eq(str) | numbers) & values.notna()
+    _put(result, index, _apply_cells(values[other], convert, errors))
+    return pd.Series(result, index=index, dtype=object)
+
+
+def _datetime_column(values: pd.Series, errors: Dict[int, str]) -> pd.Series:
+    """Vectorized ``_to_iso_datetime``."""
+    index = values.index
+    result = np.full(len(values), _to_iso_datetime(None), dtype=object)
+    kinds = _kinds(values)
+
+    dates = kinds.isin(_DATETIME_TYPES)
+    _put(result, index, values[dates].map(lambda value: value.isoformat()))
+
+    strings = values[kinds.eq(str)]
+    parsed, pending = _parse_date_strings(strings[strings.ne("")])
+    for stamps in parsed:
+        _put(result, index, _iso_datetimes(stamps))
+    _put(result, index, _apply_cells(pending, _to_iso_datetime, errors))
+
+    other = ~(dates | kinds.eq(str)) & values.notna()
+    _put(result, index, _apply_cells(values[other], _to_iso_datetime, errors))
+    return pd.Series(result, index=index, dtype=object)
+
+
+def _float_column(values: pd.Series, errors: Dict[int, str]) -> pd.Series:
+    """Vectorized ``_to_float``."""
+    result = np.full(len(values), None, dtype=object)
+    numbers = _kinds(values).isin(_NUMBER_TYPES) & values.notna()
+    _put(result, values.index, values[numbers].astype(float))
+    other = ~numbers & values.notna()
+    _put(result, values.index, _apply_cells(values[other], _to_float, errors))
+    return pd.Series(result, index=values.index, dtype=object)
+
+
+def _int_column(
+    values: pd.Series, label: str, default: Optional[int], errors: Dict[int, str]
+) -> pd.Series:
+    """Whole numbers as Python ints; empty cells become ``default``."""
+    result = np.full(len(values), default, dtype=object)
+    numbers = _kinds(values).isin(_NUMBER_TYPES) & values.notna()
+    _put(result, values.index, values[numbers].map(int))
+
+    def convert(value) -> int:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{label} must be a number, got {value!r}.") from None
+
+    other = ~numbers & values.notna() & values.ne("")
+    _put(result, values.index, _apply_cells(values[other], convert, errors))
+    return pd.Series(result, index=values.index, dtype=object)
+
+
+def _required(values: pd.Series, message: str, errors: Dict[int, str]) -> None:
+    for position in values.index[values.eq("")]:
+        errors.setdefault(position, message)
+
+
+def _case_records(cells: Cells, index: pd.Index, errors: Dict[int, str]) -> Columns:
+    def column(header: str) -> pd.Series:
+        return _cells(cells, index, header)
+
+    def text(header: str) -> pd.Series:
+        return _text_column(column(header))
+
+    case_id = text("Case ID")
+    _required(case_id, "Each case row must include a Case ID.", errors)
+    last_sub_status = text("Last Sub-Status")
+    return {
+        "case_id": case_id,
+        "seller_id": _int_column(column("Seller ID"), "Seller ID", 0, errors),
+        "seller_name": text("Seller Name"),
+        "specialist_id": text("Specialist ID"),
+        "specialist_name": text("Specialist Name"),
+        "marketplace": text("Marketplace"),
+        "case_source": text("Case Source"),
+        "case_status": text("Case Status"),
+        "workstream": text("Workstream"),
+        "listing_start_date": _date_column(
+            column("Listing Start Date"), "Listing Start Date", errors
+        ),
+        "listing_completion_date": _date_column(
+            column("Listing Completion Date"), "Listing Completion Date", errors
+        ),
+        "issue_type": _list_column(column("Issue Type")),
+        "complexity": text("Complexity"),
+        "priority": text("Priority"),
+        "api_supported": _list_column(column("API Supported")),
+        "integration_type": text("Integration Type"),
+        "seller_type": text("Seller Type"),
+        "feedback_received": text("Feedback Received")
+        .str.lower()
+        .str.startswith("y"),
+        "csat_score": _float_column(column("CSAT Score"), errors),
+        "notes": text("Notes"),
+        "last_sub_status": last_sub_status.where(last_sub_status.ne(""), None),
+    }
+
+
+def _update_records(cells: Cells, index: pd.Index, errors: Dict[int, str]) -> Columns:
+    # Rows without a Case ID are skipped.
+    index = index[_text_column(_cells(cells, index, "Case ID")).ne("").to_numpy()]
+
+    def column(header: str) -> pd.Series:
+        return _cells(cells, index, header)
+
+    def text(header: str) -> pd.Series:
+        return _text_column(column(header))
+
+    return {
+        "id": _int_column(column("ID"), "ID", None, errors),
+        "case_id": text("Case ID"),
+        "note": text("Note"),
+        "updated_by": text("Updated By"),
+        "timestamp": _datetime_column(column("Timestamp"), errors),
+        "sub_status": text("Sub Status"),
+    }
 
 
 def _to_iso_date(value) -> str:
@@ -198,8 +813,12 @@ def _to_iso_date(value) -> str:
         except Exception:
             return value
     if isinstance(value, (int, float)):
-        ts = pd.to_datetime(value, unit="d", origin="1899-12-30")
-        return ts.date().isoformat()
+        try:
+            ts = pd.to_datetime(float(value), unit="D", origin=_EXCEL_EPOCH)
+            return ts.date().isoformat()
+        except (ValueError, OverflowError, NotImplementedError):
+            # pandas raises any of these for serials beyond its date range.
+            raise ValueError(f"{value!r} is out of range for a date.") from None
     return str(value)
 
 
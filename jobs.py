@@ -0,0 +1,352 @@
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import db
+import excel_utils
+import validation
+
+# Background imports/exports run on a small thread pool in the app process;
+# their status lives in the ``jobs`` table and their files under JOBS_DIR,
+# which defaults to "<db name>_jobs" next to db.DB_PATH.
+JOBS_DIR: Optional[Path] = (
+    Path(os.environ["CASE_MGMT_JOBS_DIR"])
+    if os.environ.get("CASE_MGMT_JOBS_DIR")
+    else None
+)
+JOB_WORKERS = int(os.environ.get("CASE_MGMT_JOB_WORKERS", "2"))
+JOB_RETENTION_HOURS = 24
+PROGRESS_INTERVAL_ROWS = excel_utils.IMPORT_CHUNK_SIZE
+# While this process has jobs queued or running it refreshes their
+# heartbeat; other server processes sharing the database fail a job only
+# once its heartbeat is JOB_STALE_SECONDS old, i.e. its process is gone.
+JOB_HEARTBEAT_SECONDS = 10
+JOB_STALE_SECONDS = 6 * JOB_HEARTBEAT_SECONDS
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_active_jobs: Set[int] = set()
+_active_lock = threading.Lock()
+_stop_heartbeat = threading.Event()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _stop_heartbeat.clear()
+            threading.Thread(
+                target=_heartbeat, name="case-mgmt-job-heartbeat", daemon=True
+            ).start()
+            _executor = ThreadPoolExecutor(
+                max_workers=JOB_WORKERS, thread_name_prefix="case-mgmt-job"
+            )
+        return _executor
+
+
+def _heartbeat() -> None:
+    while not _stop_heartbeat.wait(JOB_HEARTBEAT_SECONDS):
+        with _active_lock:
+            job_ids = sorted(_active_jobs)
+        if job_ids:
+            try:
+                db.touch_jobs(job_ids)
+            except Exception:
+                # A missed beat is retried on the next one.
+                continue
+
+
+def shutdown(wait: bool = True) -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+            _stop_heartbeat.set()
+
+
+def job_dir(job_id: int) -> Path:
+    root = JOBS_DIR or db.DB_PATH.with_name(f"{db.DB_PATH.stem}_jobs")
+    return root / str(job_id)
+
+
+class JobError(Exception):
+    """A job failure that still has a result and/or file to keep."""
+
+    def __init__(
+        self,
+        message: str,
+        result: Optional[Dict[str, Any]] = None,
+        artifact: Optional[Path] = None,
+    ):
+        super().__init__(message)
+        self.result = result
+        self.artifact = artifact
+
+
+class _Progress:
+    """Counts rows as a job consumes them and reports to the ``jobs`` row
+    every ``PROGRESS_INTERVAL_ROWS`` rows."""
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self.rows = 0
+        self._reported = 0
+
+    def stage(self, name: str) -> None:
+        self.rows = self._reported = 0
+        db.update_job_progress(self.job_id, 0, name)
+
+    def add(self, rows: int) -> None:
+        self.rows += rows
+        if self.rows - self._reported >= PROGRESS_INTERVAL_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        db.update_job_progress(self.job_id, self.rows)
+        self._reported = self.rows
+
+    def rows_of(self, rows: Iterable[Any]) -> Iterator[Any]:
+        for row in rows:
+            yield row
+            self.add(1)
+
+    def chunks_of(self, chunks: Iterable[List[Any]]) -> Iterator[List[Any]]:
+        for chunk in chunks:
+            yield chunk
+            self.add(len(chunk))
+
+
+def _submit(
+    kind: str,
+    params: Dict[str, Any],
+    work: Callable[[int, _Progress], Tuple[Dict[str, Any], Optional[Path]]],
+    prepare: Optional[Callable[[int], None]] = None,
+) -> int:
+    purge_finished_jobs()
+    db.fail_interrupted_jobs(JOB_STALE_SECONDS)
+    executor = _get_executor()
+    job_id = db.create_job(kind, params)
+    with _active_lock:
+        _active_jobs.add(job_id)
+    try:
+        if prepare is not None:
+            prepare(job_id)
+        executor.submit(_run, job_id, work)
+    except Exception as exc:
+        with _active_lock:
+            _active_jobs.discard(job_id)
+        db.fail_job(job_id, str(exc))
+        raise
+    return job_id
+
+
+def _run(
+    job_id: int,
+    work: Callable[[int, _Progress], Tuple[Dict[str, Any], Optional[Path]]],
+) -> None:
+    progress = _Progress(job_id)
+    try:
+        db.start_job(job_id)
+        result, artifact = work(job_id, progress)
+        progress.flush()
+        db.finish_job(job_id, result, str(artifact) if artifact else None)
+    except JobError as exc:
+        db.fail_job(
+            job_id, str(exc), exc.result, str(exc.artifact) if exc.artifact else None
+        )
+    except Exception as exc:
+        db.fail_job(job_id, str(exc))
+    finally:
+        with _active_lock:
+            _active_jobs.discard(job_id)
+
+
+def submit_export(
+    file_format: str,
+    file_name: str,
+    filters: Optional[Dict[str, Any]] = None,
+    include_archived: bool = False,
+) -> int:
+    """Queue an export of the matching cases (and all updates) to
+    ``file_name`` in ``file_format``; see ``excel_utils.write_export``."""
+    filters = filters or {}
+
+    def work(job_id: int, progress: _Progress) -> Tuple[Dict[str, Any], Path]:
+        target = job_dir(job_id) / file_name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        progress.stage("exporting")
+        # Written under a temporary name so a half-written file is never
+        # served as the artifact.
+        partial = target.with_name(target.name + ".partial")
+        with partial.open("wb") as export_file:
+            excel_utils.write_export(
+                export_file,
+                file_format,
+                progress.rows_of(
+                    excel_utils.export_case_rows(
+                        db.iter_case_rows(filters, include_archived)
+                    )
+                ),
+                progress.rows_of(
+                    db.iter_update_rows(include_archived=include_archived)
+                ),
+            )
+        partial.replace(target)
+        return {"rows": progress.rows, "bytes": target.stat().st_size}, target
+
+    return _submit(
+        "export",
+        {
+            "file_format": file_format,
+            "file_name": file_name,
+            "filters": filters,
+            "include_archived": include_archived,
+        },
+        work,
+    )
+
+
+def _save_upload(file: IO[bytes], file_name: str) -> Callable[[int], None]:
+    def save(job_id: int) -> None:
+        source = job_dir(job_id) / file_name
+        source.parent.mkdir(parents=True, exist_ok=True)
+        with source.open("wb") as saved:
+            shutil.copyfileobj(file, saved)
+
+    return save
+
+
+def _validate_upload(
+    job_id: int,
+    file_name: str,
+    source: excel_utils.ImportSource,
+    allowed_values: Optional[validation.AllowedValues],
+    progress: _Progress,
+) -> Tuple[Dict[str, Any], Optional[Path]]:
+    """Validate an uploaded file; returns the report summary and the
+    annotated report workbook, written only if there were issues."""
+    progress.stage("validating")
+    report = validation.validate_import(
+        source, allowed_values, on_rows=progress.add
+    )
+    if not report.issues:
+        return report.summary(), None
+    progress.stage("writing report")
+    target = job_dir(job_id) / f"{Path(file_name).stem}_issues.xlsx"
+    with target.open("wb") as report_file:
+        validation.write_report_workbook(report_file, source, report)
+    return report.summary(), target
+
+
+def submit_validation(
+    file: IO[bytes],
+    file_name: str,
+    allowed_values: Optional[validation.AllowedValues] = None,
+) -> int:
+    """Copy an uploaded import file to the job's directory and queue a full
+    check of it (see ``validation.validate_import``) without importing.
+
+    The job's result counts rows, errors and warnings; its artifact, if
+    there were any, is the annotated report workbook.
+    """
+    file_name = Path(file_name).name
+
+    def work(job_id: int, progress: _Progress) -> Tuple[Dict[str, Any], Optional[Path]]:
+        with (job_dir(job_id) / file_name).open("rb") as upload:
+            source = excel_utils.open_import_file(upload, file_name)
+            try:
+                return _validate_upload(
+                    job_id, file_name, source, allowed_values, progress
+                )
+            finally:
+                source.close()
+
+    return _submit(
+        "validate",
+        {"file_name": file_name},
+        work,
+        _save_upload(file, file_name),
+    )
+
+
+def submit_import(
+    file: IO[bytes],
+    file_name: str,
+    mode: str = "skip",
+    allowed_values: Optional[validation.AllowedValues] = None,
+    strict: bool = False,
+) -> int:
+    """Copy an uploaded import file to the job's directory and queue its
+    import in ``mode`` (see ``db.bulk_import``); the file is read with
+    ``excel_utils.open_import_file``.
+
+    With ``strict=True`` the whole file is validated first, as by
+    ``submit_validation``, against ``allowed_values``. Any error then fails
+    the job before anything is written, keeping the report workbook as its
+    artifact; with only warnings the import goes ahead and the report is
+    kept alongside its counts. Otherwise the file is imported as it is and
+    the job fails only on a row the importer cannot read.
+    """
+    if mode not in db.IMPORT_MODES:
+        raise ValueError(f"Unknown import mode: {mode}")
+    file_name = Path(file_name).name
+
+    def work(job_id: int, progress: _Progress) -> Tuple[Dict[str, Any], Optional[Path]]:
+        with (job_dir(job_id) / file_name).open("rb") as upload:
+            source = excel_utils.open_import_file(upload, file_name)
+            try:
+                summary, report = {}, None
+                if strict:
+                    summary, report = _validate_upload(
+                        job_id, file_name, source, allowed_values, progress
+                    )
+                if summary.get("errors"):
+                    errors = summary["errors"]
+                    raise JobError(
+                        f"{errors:,} error{'s' if errors != 1 else ''} found; "
+                        "nothing was imported.",
+                        summary,
+                        report,
+                    )
+                progress.stage("importing")
+                counts = db.bulk_import_chunks(
+                    progress.chunks_of(excel_utils.iter_case_records(source)),
+                    progress.chunks_of(excel_utils.iter_update_records(source)),
+                    mode,
+                )
+            finally:
+                source.close()
+        return {**counts, **summary}, report
+
+    return _submit(
+        "import",
+        {"file_name": file_name, "mode": mode, "strict": strict},
+        work,
+        _save_upload(file, file_name),
+    )
+
+
+def purge_finished_jobs(older_than_hours: float = JOB_RETENTION_HOURS) -> int:
+    """Delete jobs finished more than ``older_than_hours`` ago, with their
+    files. Returns the number of jobs removed."""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=older_than_hours)
+    purged = db.purge_jobs(cutoff.strftime("%Y-%m-%dT%H:%M:%S"))
+    for job in purged:
+        shutil.rmtree(job_dir(job["id"]), ignore_errors=True)
+    return len(purged)
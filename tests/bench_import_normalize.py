@@ -0,0 +1,67 @@
+"""Time column-wise chunk normalization against the per-row helpers.
+
+    python tests/bench_import_normalize.py [rows]    # default 100,000
+
+Runs on a clean chunk (ISO dates, numbers) and on the messy mix from the
+parity tests, ``excel_utils.IMPORT_CHUNK_SIZE`` rows per chunk.
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import excel_utils  # noqa: E402
+from excel_utils import CASE_COLUMNS  # noqa: E402
+from test_import_normalize import CASE_POOLS, messy_rows, reference_case  # noqa: E402
+
+
+def clean_rows(count: int) -> List[Tuple]:
+    start = datetime(2020, 1, 1)
+    return [
+        (
+            f"C{i}", i, "Seller", "S1", "Specialist", "EU", "ASTRO", "WIP",
+            "Listings", start + timedelta(days=i % 2000), "2024-01-01",
+            "Bug, Other", "Low", "P1", "REST API", "Direct", "New", "Yes", 4.5,
+            "note", "WIP",
+        )
+        for i in range(count)
+    ]
+
+
+def per_row(raw: List[Tuple]) -> None:
+    for values in raw:
+        reference_case(dict(zip(CASE_COLUMNS, values)))
+
+
+def column_wise(raw: List[Tuple]) -> None:
+    size = excel_utils.IMPORT_CHUNK_SIZE
+    for start in range(0, len(raw), size):
+        chunk = raw[start : start + size]
+        excel_utils.normalize_rows("Cases", CASE_COLUMNS, chunk)
+
+
+def timed(run: Callable[[List[Tuple]], None], raw: List[Tuple]) -> float:
+    started = time.perf_counter()
+    run(raw)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for label, raw in (
+        ("clean", clean_rows(rows)),
+        ("messy", messy_rows(CASE_COLUMNS, CASE_POOLS, rows)),
+    ):
+        slow = timed(per_row, raw)
+        fast = timed(column_wise, raw)
+        print(
+            f"{label}: {rows:,} rows  per-row {slow:.2f}s  "
+            f"column-wise {fast:.2f}s  ({slow / fast:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
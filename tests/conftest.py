@@ -0,0 +1,16 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The app's modules live at the repository root, not in a package.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import db  # noqa: E402
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "case_mgmt.db")
+    db.init_db()
+    return db.DB_PATH
@@ -0,0 +1,86 @@
+import pytest
+
+import db
+
+
+def case(case_id: str, **fields) -> dict:
+    return {
+        "case_id": case_id,
+        "seller_id": 1,
+        "seller_name": "Seller",
+        "specialist_id": "S1",
+        "specialist_name": "Specialist",
+        "marketplace": "EU",
+        "case_source": "ASTRO",
+        "case_status": "COMPLETED",
+        "workstream": "Listings",
+        "listing_start_date": "2020-01-01",
+        "listing_completion_date": "2020-01-02",
+        "issue_type": [],
+        "complexity": "Low",
+        "priority": "P1",
+        "api_supported": [],
+        "integration_type": "Direct",
+        "seller_type": "New",
+        "feedback_received": False,
+        "csat_score": None,
+        "notes": "",
+        "last_sub_status": None,
+        **fields,
+    }
+
+
+def add_update(case_id: str, note: str) -> None:
+    db.create_update(
+        {
+            "case_id": case_id,
+            "note": note,
+            "updated_by": "me",
+            "timestamp": "2020-01-02 10:00:00",
+            "sub_status": "WIP",
+        }
+    )
+
+
+def archived_notes(case_id: str) -> list:
+    return [
+        update["note"]
+        for update in db.list_updates(case_id, include_archived=True)
+    ]
+
+
+def test_archived_history_survives_a_recreated_case(database):
+    db.create_case(case("C1"))
+    add_update("C1", "old history")
+    assert db.archive_closed_cases(older_than_days=0) == 1
+
+    with pytest.raises(ValueError, match="already exists in the archive"):
+        db.create_case(case("C1", notes="new"))
+    counts = db.bulk_import([case("C1", notes="new")], [])
+    assert counts["skipped_cases"] == 1 and counts["created_cases"] == 0
+
+    # A live duplicate written before these checks existed.
+    db.run_write(
+        lambda conn: conn.execute(db._INSERT_CASE_SQL, db._case_payload(case("C1")))
+    )
+    add_update("C1", "new history")
+    assert db.archive_closed_cases(older_than_days=0) == 0
+
+    assert db.get_case("C1") is not None
+    assert archived_notes("C1") == ["new history", "old history"]
+    with db.get_connection() as conn:
+        rows = conn.execute(
+            "SELECT note FROM archive.updates WHERE case_id = 'C1'"
+        ).fetchall()
+    assert [row["note"] for row in rows] == ["old history"]
+
+
+def test_interrupted_archive_is_finished(database):
+    db.create_case(case("C2"))
+    add_update("C2", "history")
+    # Copy without the removal step, as when a run stops in between.
+    db.run_write(lambda conn: db._copy_to_archive(conn, 2**62, 10))
+
+    assert db.archive_closed_cases(older_than_days=0) == 1
+    assert db.get_case("C2") is None
+    assert archived_notes("C2") == ["history"]
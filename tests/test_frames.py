@@ -0,0 +1,23 @@
+import db
+from test_archive import add_update, case
+
+
+def test_frame_readers_concatenate_pages(database, monkeypatch):
+    monkeypatch.setattr(db, "FRAME_PAGE_SIZE", 2)
+    statuses = ["WIP", "COMPLETED", "WIP", "PENDING", "WIP"]
+    for number, status in enumerate(statuses):
+        db.create_case(case(f"C{number}", case_status=status))
+        add_update(f"C{number}", f"note {number}")
+
+    cases = db.list_cases_frame()
+    assert list(cases["case_id"]) == [f"C{number}" for number in range(5)]
+    assert cases["case_status"].dtype == "category"
+    assert list(cases["case_status"]) == statuses
+    assert list(cases.columns) == list(
+        db.list_cases_page(page_size=10, as_frame=True).rows.columns
+    )
+
+    updates = db.list_updates_frame()
+    assert len(updates) == 5
+    assert updates["sub_status"].dtype == "category"
+    assert list(db.list_updates_frame("C3")["note"]) == ["note 3"]
@@ -0,0 +1,66 @@
+import io
+import time
+
+import pytest
+
+import db
+import excel_utils
+import jobs
+
+ALLOWED_VALUES = {"Marketplace": ["EU", "US"]}
+
+
+def upload(marketplace: str) -> io.BytesIO:
+    row = [
+        "C1", 1, "Seller", "S1", "Specialist", marketplace, "ASTRO", "WIP",
+        "Listings", "2024-01-01", "", "", "Low", "P1", "", "Direct", "New",
+        "No", "", "", "",
+    ]
+    file = io.BytesIO()
+    excel_utils.write_export_workbook(file, [row], [])
+    file.seek(0)
+    return file
+
+
+def wait(job_id: int) -> dict:
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        job = db.get_job(job_id)
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not finish.")
+
+
+@pytest.fixture
+def jobs_dir(database, tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "JOBS_DIR", tmp_path / "jobs")
+
+
+def test_import_ignores_check_errors_unless_strict(jobs_dir):
+    job = wait(
+        jobs.submit_import(upload("Mars"), "cases.xlsx", "skip", ALLOWED_VALUES)
+    )
+    assert job["status"] == "succeeded"
+    assert job["result"]["created_cases"] == 1
+    assert db.get_case("C1")["marketplace"] == "Mars"
+
+
+def test_strict_import_writes_nothing_on_check_errors(jobs_dir):
+    job = wait(
+        jobs.submit_import(
+            upload("Mars"), "cases.xlsx", "skip", ALLOWED_VALUES, strict=True
+        )
+    )
+    assert job["status"] == "failed"
+    assert "nothing was imported" in job["error"]
+    assert db.get_case("C1") is None
+
+    job = wait(
+        jobs.submit_import(
+            upload("EU"), "cases.xlsx", "skip", ALLOWED_VALUES, strict=True
+        )
+    )
+    assert job["status"] == "succeeded"
+    assert job["result"]["errors"] == 0
+    assert db.get_case("C1")["marketplace"] == "EU"
@@ -0,0 +1,212 @@
+"""Parity of the column-wise import normalizers with the per-cell helpers.
+
+``reference_case`` / ``reference_update`` normalize one row at a time with
+``_to_iso_date``, ``_to_iso_datetime`` and ``_to_float``, the way the
+importer did before chunks were normalized column by column.
+"""
+import random
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+import excel_utils
+from excel_utils import CASE_COLUMNS, UPDATE_COLUMNS, ImportValidationError
+
+
+def _text(value) -> str:
+    return "" if value is None else str(value).strip()
+
+
+def _split_names(value) -> List[str]:
+    return [part.strip() for part in _text(value).split(",") if part.strip()]
+
+
+def reference_case(row: Dict[str, Any]) -> Dict[str, Any]:
+    case_id = _text(row.get("Case ID"))
+    if not case_id:
+        raise ValueError("Each case row must include a Case ID.")
+    try:
+        seller_id = int(row.get("Seller ID") or 0)
+    except (TypeError, ValueError):
+        raise ValueError("Seller ID must be a number.") from None
+    return {
+        "case_id": case_id,
+        "seller_id": seller_id,
+        "seller_name": _text(row.get("Seller Name")),
+        "specialist_id": _text(row.get("Specialist ID")),
+        "specialist_name": _text(row.get("Specialist Name")),
+        "marketplace": _text(row.get("Marketplace")),
+        "case_source": _text(row.get("Case Source")),
+        "case_status": _text(row.get("Case Status")),
+        "workstream": _text(row.get("Workstream")),
+        "listing_start_date": excel_utils._to_iso_date(
+            row.get("Listing Start Date")
+        ),
+        "listing_completion_date": excel_utils._to_iso_date(
+            row.get("Listing Completion Date")
+        ),
+        "issue_type": _split_names(row.get("Issue Type")),
+        "complexity": _text(row.get("Complexity")),
+        "priority": _text(row.get("Priority")),
+        "api_supported": _split_names(row.get("API Supported")),
+        "integration_type": _text(row.get("Integration Type")),
+        "seller_type": _text(row.get("Seller Type")),
+        "feedback_received": _text(row.get("Feedback Received"))
+        .lower()
+        .startswith("y"),
+        "csat_score": excel_utils._to_float(row.get("CSAT Score")),
+        "notes": _text(row.get("Notes")),
+        "last_sub_status": _text(row.get("Last Sub-Status")) or None,
+    }
+
+
+def reference_update(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    case_id = _text(row.get("Case ID"))
+    if not case_id:
+        return None
+    update_id = row.get("ID")
+    try:
+        update_id = int(update_id) if update_id not in (None, "") else None
+    except (TypeError, ValueError):
+        raise ValueError("ID must be a number.") from None
+    return {
+        "id": update_id,
+        "case_id": case_id,
+        "note": _text(row.get("Note")),
+        "updated_by": _text(row.get("Updated By")),
+        "timestamp": excel_utils._to_iso_datetime(row.get("Timestamp")),
+        "sub_status": _text(row.get("Sub Status")),
+    }
+
+
+TEXT = [None, "", "  ", " Seller ", "Seller", 123, 4.5, True, datetime(2024, 3, 5)]
+NAMES = [None, "", "Bug, Other", " , Bug ,", "Bug", 5]
+WHOLE_NUMBERS = [None, "", 12, 12.0, "12", 4.7, True, 0]
+DATES = [
+    None,
+    "",
+    "  ",
+    "2024-03-05",
+    " 03/05/2024 ",
+    "5 March 2024",
+    "2024-03-05T10:30:00",
+    "2024-03-05T10:30:00+02:00",
+    "not a date",
+    45000,
+    45000.75,
+    1,
+    datetime(2024, 3, 5, 8),
+    date(2024, 3, 5),
+    True,
+]
+SCORES = [None, "", "4.5", " 3 ", 4, 4.5, "n/a", True]
+FEEDBACK = [None, "", "Yes", " y", "No", 1]
+# Blank or unreadable timestamps become "now", which cannot be compared.
+TIMESTAMPS = [
+    "2024-03-05 10:30",
+    "2024-03-05T10:30:00Z",
+    "2024-03-05T10:30:00+02:00",
+    "03/05/2024 08:00",
+    datetime(2024, 3, 5, 8, 15, 30),
+    datetime(2024, 3, 5, 8, 15, 30, 250),
+    45000,
+]
+
+CASE_POOLS = {
+    "Case ID": ["C1", " C2 ", 3, "C4"],
+    "Seller ID": WHOLE_NUMBERS,
+    "Listing Start Date": DATES,
+    "Listing Completion Date": DATES,
+    "Issue Type": NAMES,
+    "API Supported": NAMES,
+    "Feedback Received": FEEDBACK,
+    "CSAT Score": SCORES,
+}
+UPDATE_POOLS = {
+    "ID": [None, "", 7, "8", 9.0],
+    "Case ID": ["C1", " C2 ", None, "  ", 3],
+    "Timestamp": TIMESTAMPS,
+}
+
+
+def messy_rows(headers: List[str], pools: Dict[str, list], count: int) -> List[Tuple]:
+    rng = random.Random(15)
+    return [
+        tuple(rng.choice(pools.get(header, TEXT)) for header in headers)
+        for _ in range(count)
+    ]
+
+
+def column_records(sheet: str, headers: List[str], raw: List[Tuple]):
+    _, columns, errors = excel_utils.normalize_rows(sheet, headers, raw)
+    values = {field: column.to_dict() for field, column in columns.items()}
+    index = columns["case_id"].index
+    records = {
+        position: {field: values[field][position] for field in columns}
+        for position in index
+        if position not in errors
+    }
+    return records, errors
+
+
+def reference_records(headers: List[str], raw: List[Tuple], normalize):
+    records, errors = {}, set()
+    for position, values in enumerate(raw):
+        try:
+            record = normalize(dict(zip(headers, values)))
+        except ValueError:
+            errors.add(position)
+            continue
+        if record is not None:
+            records[position] = record
+    return records, errors
+
+
+def test_case_columns_match_per_cell_helpers():
+    raw = messy_rows(CASE_COLUMNS, CASE_POOLS, 600)
+    raw += [
+        (None,) + raw[0][1:],
+        ("C9", "abc") + raw[0][2:],
+        ("C10", "4.5") + raw[0][2:],
+    ]
+
+    records, errors = column_records("Cases", CASE_COLUMNS, raw)
+    expected, expected_errors = reference_records(CASE_COLUMNS, raw, reference_case)
+
+    assert set(errors) == expected_errors == {600, 601, 602}
+    assert records == expected
+
+
+def test_update_columns_match_per_cell_helpers():
+    raw = messy_rows(UPDATE_COLUMNS, UPDATE_POOLS, 400)
+    raw.append(("not an id", "C1", "note", "me", TIMESTAMPS[0], "x"))
+
+    records, errors = column_records("Updates", UPDATE_COLUMNS, raw)
+    expected, expected_errors = reference_records(
+        UPDATE_COLUMNS, raw, reference_update
+    )
+
+    assert set(errors) == expected_errors == {400}
+    assert records == expected
+
+
+@pytest.mark.parametrize("serial", [1e7, -1e9, 1e20, float("inf")])
+def test_out_of_range_serial_date_is_a_row_error(serial):
+    with pytest.raises(ValueError, match="out of range"):
+        excel_utils._to_iso_date(serial)
+
+    good = messy_rows(CASE_COLUMNS, {"Case ID": ["C1"], **CASE_POOLS}, 3)
+    good = [("C1", 1) + row[2:] for row in good]
+    start = CASE_COLUMNS.index("Listing Start Date")
+    bad = list(good[0])
+    bad[start] = serial
+    raw = good + [tuple(bad)]
+
+    _, _, errors = excel_utils.normalize_rows("Cases", CASE_COLUMNS, raw)
+    assert list(errors) == [3]
+    assert errors[3].startswith("Listing Start Date:")
+
+    with pytest.raises(ImportValidationError) as raised:
+        excel_utils._normalize_chunk("Cases", CASE_COLUMNS, [2, 3, 4, 5], raw)
+    assert raised.value.row == 5
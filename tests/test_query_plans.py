@@ -0,0 +1,8 @@
+import db
+
+
+def test_hot_queries_use_indexes(database):
+    plans = db.verify_query_plans()
+    assert "list_cases()" in plans
+    assert any(name.startswith("list_cases_page(") for name in plans)
+    assert any(name.startswith("list_updates_page(") for name in plans)
@@ -0,0 +1,501 @@
+"""Whole-file import validation.
+
+The importer stops at the first row it cannot read. ``validate_import``
+instead checks every row of an import file, in chunks spread over a process
+pool, and collects all problems into a ``ValidationReport`` that
+``write_report_workbook`` turns into an annotated copy of the file.
+
+Problems are errors (the import would refuse or corrupt the row) or
+warnings (the row imports, but not quite as written, e.g. it is skipped).
+"""
+
+import multiprocessing
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Collection,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+
+import db
+import excel_utils
+
+ERROR = "error"
+WARNING = "warning"
+# 0 means one worker per CPU; 1 validates in the calling process.
+VALIDATION_WORKERS = (
+    int(os.environ.get("CASE_MGMT_VALIDATION_WORKERS", "0")) or os.cpu_count() or 1
+)
+# Extra column of the report workbook; ignored when the report is imported.
+REPORT_COLUMN = "Import Issues"
+
+# Column header -> allowed values. A blank cell is only allowed when "" is
+# one of the values; columns without an entry accept anything.
+AllowedValues = Mapping[str, Collection[str]]
+
+_SHEET_COLUMNS = {
+    "Cases": excel_utils.CASE_COLUMNS,
+    "Updates": excel_utils.UPDATE_COLUMNS,
+}
+_OPTION_COLUMNS = ("Issue Type", "API Supported")
+_DATE_COLUMNS = ("Listing Start Date", "Listing Completion Date")
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}$")
+
+_SEVERITY_FILLS = {
+    ERROR: PatternFill("solid", fgColor="F8CBAD"),
+    WARNING: PatternFill("solid", fgColor="FFE699"),
+}
+
+
+class Issue(NamedTuple):
+    sheet: str
+    # Sheet row number, header = 1.
+    row: int
+    # Header of the offending cell, or None for the whole row.
+    column: Optional[str]
+    severity: str
+    message: str
+
+
+class ValidationReport(NamedTuple):
+    issues: List[Issue]
+    # Non-blank rows checked per sheet.
+    rows: Dict[str, int]
+
+    @property
+    def errors(self) -> List[Issue]:
+        return [issue for issue in self.issues if issue.severity == ERROR]
+
+    @property
+    def warnings(self) -> List[Issue]:
+        return [issue for issue in self.issues if issue.severity == WARNING]
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "rows": sum(self.rows.values()),
+            "errors": len(self.errors),
+            "warnings": len(self.warnings),
+        }
+
+
+class _ChunkResult(NamedTuple):
+    issues: List[Issue]
+    rows: int
+    # (case ID, row) of every case row, or of every update row with a Case ID.
+    case_ids: List[Tuple[str, int]]
+    # Option column -> {name: first row naming it}.
+    options: Dict[str, Dict[str, int]]
+
+
+def validate_import(
+    source: excel_utils.ImportSource,
+    allowed_values: Optional[AllowedValues] = None,
+    workers: int = VALIDATION_WORKERS,
+    chunk_size: int = excel_utils.IMPORT_CHUNK_SIZE,
+    on_rows: Optional[Callable[[int], None]] = None,
+) -> ValidationReport:
+    """Check every row of an import file and report all problems.
+
+    Rows are checked in chunks of ``chunk_size`` on ``workers`` processes:
+    the importer's own parsing (required Case ID, numeric IDs), readable
+    dates, timestamps and scores, and ``allowed_values``. Checks across
+    chunks run here afterwards: repeated case IDs, updates whose case is
+    neither in the file nor in the database, and Issue Type / API names
+    that are not options yet. ``on_rows`` is called with the row count of
+    each checked chunk.
+    """
+    allowed = {
+        header: frozenset(values) for header, values in (allowed_values or {}).items()
+    }
+    issues: List[Issue] = []
+    rows: Dict[str, int] = {}
+    case_rows: Dict[str, int] = {}
+    update_case_ids: List[Tuple[str, int]] = []
+    options: Dict[str, Dict[str, int]] = {column: {} for column in _OPTION_COLUMNS}
+
+    for sheet in _SHEET_COLUMNS:
+        rows[sheet] = 0
+        for result in _map_chunks(
+            _chunk_tasks(source, sheet, chunk_size, allowed, issues), workers
+        ):
+            issues.extend(result.issues)
+            rows[sheet] += result.rows
+            if on_rows is not None:
+                on_rows(result.rows)
+            if sheet == "Updates":
+                update_case_ids.extend(result.case_ids)
+                continue
+            for case_id, row in result.case_ids:
+                first_row = case_rows.setdefault(case_id, row)
+                if first_row != row:
+                    issues.append(
+                        Issue(
+                            sheet,
+                            row,
+                            "Case ID",
+                            WARNING,
+                            f"Case ID {case_id} repeats row {first_row}; "
+                            "this row will be skipped.",
+                        )
+                    )
+            for column, names in result.options.items():
+                for name, row in names.items():
+                    options[column].setdefault(name, row)
+
+    issues.extend(_option_issues(options))
+    issues.extend(_orphan_issues(update_case_ids, case_rows))
+    sheet_order = list(_SHEET_COLUMNS)
+    issues.sort(key=lambda issue: (sheet_order.index(issue.sheet), issue.row))
+    return ValidationReport(issues, rows)
+
+
+def _chunk_tasks(
+    source: excel_utils.ImportSource,
+    sheet: str,
+    chunk_size: int,
+    allowed: Dict[str, frozenset],
+    issues: List[Issue],
+) -> Iterator[Tuple[Any, ...]]:
+    checked_headers = False
+    for headers, numbers, raw in excel_utils.iter_raw_chunks(source, sheet, chunk_size):
+        if not checked_headers:
+            issues.extend(_header_issues(sheet, headers, allowed))
+            checked_headers = True
+        yield sheet, headers, numbers, raw, allowed
+
+
+def _map_chunks(
+    tasks: Iterator[Tuple[Any, ...]], workers: int
+) -> Iterator[_ChunkResult]:
+    """``_check_chunk`` over ``tasks`` in order, on a process pool when
+    ``workers`` > 1 and there is more than one chunk. At most two chunks per
+    worker are in flight, so the file is never held in memory whole."""
+    tasks = iter(tasks)
+    first = next(tasks, None)
+    if first is None:
+        return
+    second = next(tasks, None)
+    if workers <= 1 or second is None:
+        # Starting worker processes costs more than a single chunk.
+        yield _check_chunk(*first)
+        if second is not None:
+            yield _check_chunk(*second)
+        for task in tasks:
+            yield _check_chunk(*task)
+        return
+    # Spawned rather than forked: the app process runs threads (Streamlit,
+    # the db writer) whose locks a fork could copy mid-use.
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        pending: Deque[Future] = deque(
+            [pool.submit(_check_chunk, *first), pool.submit(_check_chunk, *second)]
+        )
+        for task in tasks:
+            pending.append(pool.submit(_check_chunk, *task))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _header_issues(
+    sheet: str, headers: List[str], allowed: Dict[str, frozenset]
+) -> List[Issue]:
+    issues = []
+    for header in _SHEET_COLUMNS[sheet]:
+        if header in headers:
+            continue
+        if header == "Case ID" or (header in allowed and "" not in allowed[header]):
+            issues.append(
+                Issue(sheet, 1, None, ERROR, f"Column {header!r} is missing.")
+            )
+        else:
+            issues.append(
+                Issue(
+                    sheet,
+                    1,
+                    None,
+                    WARNING,
+                    f"Column {header!r} is missing; it will be imported blank.",
+                )
+            )
+    for header in headers:
+        if header and header != REPORT_COLUMN and header not in _SHEET_COLUMNS[sheet]:
+            issues.append(
+                Issue(
+                    sheet,
+                    1,
+                    header,
+                    WARNING,
+                    f"Column {header!r} is not a {sheet} column and is ignored.",
+                )
+            )
+    return issues
+
+
+def _check_chunk(
+    sheet: str,
+    headers: List[str],
+    numbers: List[int],
+    raw: List[Tuple],
+    allowed: Dict[str, frozenset],
+) -> _ChunkResult:
+    """Validate one chunk of rows; runs in a pool worker."""
+    cells, columns, errors = excel_utils.normalize_rows(sheet, headers, raw)
+    issues: List[Issue] = []
+
+    def add(position: int, column: Optional[str], severity: str, message: str):
+        issues.append(Issue(sheet, numbers[position], column, severity, message))
+
+    # The importer's own errors name the cell they are about.
+    named = sorted(cells, key=len, reverse=True)
+    for position, message in errors.items():
+        column = next((header for header in named if header in message), None)
+        add(position, column, ERROR, message)
+
+    index = columns["case_id"].index
+    if sheet == "Updates":
+        for position in sorted(set(range(len(raw))) - set(index)):
+            add(
+                position,
+                "Case ID",
+                WARNING,
+                "Update has no Case ID and will be skipped.",
+            )
+
+    for header, values in allowed.items():
+        if header not in cells:
+            continue
+        texts = [
+            "" if value is None else str(value).strip()
+            for value in cells[header].loc[index].tolist()
+        ]
+        for position, text in zip(index, texts):
+            if text not in values:
+                shown = f"{text!r} is not" if text else "a blank value is not"
+                add(position, header, ERROR, f"{header}: {shown} an allowed value.")
+
+    if sheet == "Cases":
+        for header in _DATE_COLUMNS:
+            field = excel_utils.CASE_COLUMN_FIELDS[header]
+            for position, text in columns[field].items():
+                if text and not _ISO_DATE.match(text):
+                    add(
+                        position,
+                        header,
+                        ERROR,
+                        f"{header}: cannot read {text!r} as a date.",
+                    )
+        if "CSAT Score" in cells:
+            given = cells["CSAT Score"].map(_is_given)
+            for position in index[
+                given.to_numpy() & columns["csat_score"].isna().to_numpy()
+            ]:
+                add(
+                    position,
+                    "CSAT Score",
+                    ERROR,
+                    "CSAT Score must be a number, got "
+                    f"{cells['CSAT Score'][position]!r}.",
+                )
+        options = {
+            header: _first_rows(
+                columns[excel_utils.CASE_COLUMN_FIELDS[header]], numbers
+            )
+            for header in _OPTION_COLUMNS
+        }
+    else:
+        if "Timestamp" in cells:
+            for position in _unreadable_timestamps(cells["Timestamp"].loc[index]):
+                add(
+                    position,
+                    "Timestamp",
+                    ERROR,
+                    f"Timestamp: cannot read {cells['Timestamp'][position]!r} "
+                    "as a date and time.",
+                )
+        options = {}
+
+    case_ids = [
+        (case_id, numbers[position])
+        for position, case_id in columns["case_id"].items()
+        if case_id
+    ]
+    return _ChunkResult(issues, len(raw), case_ids, options)
+
+
+def _is_given(value: Any) -> bool:
+    return value is not None and not (isinstance(value, str) and not value.strip())
+
+
+def _first_rows(lists: pd.Series, numbers: List[int]) -> Dict[str, int]:
+    first: Dict[str, int] = {}
+    for position, names in lists.items():
+        for name in names:
+            first.setdefault(name, numbers[position])
+    return first
+
+
+def _unreadable_timestamps(values: pd.Series) -> List[int]:
+    """Positions of timestamp strings the importer would replace with the
+    time of import."""
+    strings = values[values.map(lambda value: isinstance(value, str))].str.strip()
+    strings = strings[strings.ne("")]
+    if strings.empty:
+        return []
+    stamps = pd.to_datetime(strings, errors="coerce", format="mixed", utc=True)
+    unreadable = []
+    for position, text in strings[stamps.isna()].items():
+        try:
+            pd.to_datetime(text)
+        except (ValueError, TypeError, OverflowError):
+            unreadable.append(position)
+    return unreadable
+
+
+def _option_issues(options: Dict[str, Dict[str, int]]) -> List[Issue]:
+    known = {
+        "Issue Type": set(db.list_issue_options()),
+        "API Supported": set(db.list_api_options()),
+    }
+    return [
+        Issue(
+            "Cases",
+            row,
+            column,
+            WARNING,
+            f"{column}: {name!r} is not an option yet and will be added.",
+        )
+        for column, names in options.items()
+        for name, row in names.items()
+        if name not in known[column]
+    ]
+
+
+def _orphan_issues(
+    update_case_ids: List[Tuple[str, int]], case_rows: Dict[str, int]
+) -> List[Issue]:
+    """Updates whose case is not in the file: fine if the case is in the
+    database, skipped if it is archived, and an error if it is nowhere."""
+    outside = [case_id for case_id, _ in update_case_ids if case_id not in case_rows]
+    found = db.find_case_ids(outside)
+    issues = []
+    for case_id, row in update_case_ids:
+        if case_id in case_rows:
+            continue
+        schema = found.get(case_id)
+        if schema == "archive":
+            issues.append(
+                Issue(
+                    "Updates",
+                    row,
+                    "Case ID",
+                    WARNING,
+                    f"Case {case_id} is archived; this update will be skipped.",
+                )
+            )
+        elif schema is None:
+            issues.append(
+                Issue(
+                    "Updates",
+                    row,
+                    "Case ID",
+                    ERROR,
+                    f"Case {case_id} is neither in this file nor in the database.",
+                )
+            )
+    return issues
+
+
+def write_report_workbook(
+    target: IO[bytes], source: excel_utils.ImportSource, report: ValidationReport
+) -> None:
+    """Write ``source`` annotated with ``report`` as an xlsx workbook.
+
+    An Issues sheet lists every problem; the Cases and Updates sheets copy
+    the file row for row, with problem cells shaded (red for errors, yellow
+    for warnings) and the row's messages in an extra column. After fixing,
+    the workbook can be imported as it is.
+    """
+    workbook = Workbook(write_only=True)
+    bold = Font(bold=True)
+
+    summary = workbook.create_sheet("Issues")
+    summary.append(
+        [
+            _annotated_cell(summary, header, header, None, bold)
+            for header in ("Sheet", "Row", "Column", "Severity", "Message")
+        ]
+    )
+    for issue in report.issues:
+        summary.append(list(issue))
+
+    by_row: Dict[Tuple[str, int], List[Issue]] = {}
+    for issue in report.issues:
+        by_row.setdefault((issue.sheet, issue.row), []).append(issue)
+
+    for sheet in _SHEET_COLUMNS:
+        worksheet = workbook.create_sheet(sheet)
+        rows = excel_utils.iter_table_rows(source, sheet)
+        headers = [
+            str(header).strip() if header is not None else ""
+            for header in next(rows, ())
+        ]
+        # A report imported again keeps only its latest annotations.
+        keep = [i for i, header in enumerate(headers) if header != REPORT_COLUMN]
+        kept_headers = [headers[i] for i in keep]
+        worksheet.append(
+            [
+                _annotated_cell(worksheet, header, header, by_row.get((sheet, 1)), bold)
+                for header in kept_headers
+            ]
+            + [_annotated_cell(worksheet, REPORT_COLUMN, REPORT_COLUMN, None, bold)]
+        )
+        for number, values in enumerate(rows, start=2):
+            values = [values[i] if i < len(values) else None for i in keep]
+            row_issues = by_row.get((sheet, number))
+            if not row_issues:
+                worksheet.append(values)
+                continue
+            worksheet.append(
+                [
+                    _annotated_cell(worksheet, header, value, row_issues)
+                    for header, value in zip(kept_headers, values)
+                ]
+                + ["\n".join(issue.message for issue in row_issues)]
+            )
+    workbook.save(target)
+
+
+def _annotated_cell(
+    worksheet,
+    header: str,
+    value: Any,
+    issues: Optional[List[Issue]],
+    font: Optional[Font] = None,
+) -> WriteOnlyCell:
+    cell = WriteOnlyCell(worksheet, value=value)
+    if font is not None:
+        cell.font = font
+    severities = {issue.severity for issue in issues or () if issue.column == header}
+    if severities:
+        cell.fill = _SEVERITY_FILLS[ERROR if ERROR in severities else WARNING]
+    return cell